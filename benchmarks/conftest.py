@@ -0,0 +1,94 @@
+import importlib.util
+import json
+import os
+import sys
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAME_FILE = os.path.join(ROOT, "Игра Слова из слова.py")
+# Логика игры не зависит от Qt и импортируется как обычный модуль
+sys.path.insert(0, ROOT)
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Во сколько раз среднее время может превысить сохранённое, прежде чем тест упадёт
+TOLERANCE = 3.0
+
+def pytest_addoption(parser):
+    parser.addoption("--update-baseline", action="store_true", help="перезаписать benchmarks/baseline.json")
+
+def load_game():
+    spec = importlib.util.spec_from_file_location("slova", GAME_FILE)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["slova"] = module
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope="session")
+def game():
+    return importlib.import_module("slova_engine")
+
+@pytest.fixture(scope="session")
+def gui(game):
+    # Окно игры - только для тестов окна; без PyQt5 пропускаются лишь они
+    pytest.importorskip("PyQt5.QtWidgets")
+    return load_game()
+
+@pytest.fixture(scope="session")
+def levels(game):
+    return game.LevelList(game.LEVELS)
+
+@pytest.fixture
+def make_engine(game, levels):
+    # Движок на уровнях LEVELS (или source) без хранилища, если не задано иное, уже после restore()
+    def make(source=None, **options):
+        options.setdefault("store", None)
+        engine = game.GameEngine(source if source is not None else levels, **options)
+        engine.restore()
+        return engine
+    return make
+
+@pytest.fixture
+def engine(make_engine):
+    return make_engine()
+
+@pytest.fixture
+def save_dir(game, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    game.GameSave.reset_progress()
+    yield tmp_path
+    game.GameSave.reset_progress()
+
+@pytest.fixture(autouse=True)
+def telemetry(game, tmp_path, monkeypatch):
+    # Журнал игры пишется во временную папку теста; всё накопленное сбрасывается туда же,
+    # пока путь не вернулся к файлу в текущей папке
+    monkeypatch.setattr(game.Telemetry, "TELEMETRY_FILE", str(tmp_path / game.Telemetry.TELEMETRY_FILE))
+    yield game.Telemetry
+    game.Telemetry.flush()
+
+@pytest.fixture(scope="session")
+def qapp(gui):
+    return gui.QtWidgets.QApplication.instance() or gui.QtWidgets.QApplication([])
+
+@pytest.fixture(scope="session")
+def baselines():
+    if os.path.exists(BASELINE_FILE):
+        with open(BASELINE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+@pytest.fixture(autouse=True)
+def check_baseline(request, benchmark, baselines):
+    yield
+    if benchmark.stats is None:
+        return
+    name = request.node.name
+    mean = benchmark.stats.stats.mean
+    if request.config.getoption("--update-baseline"):
+        baselines[name] = mean
+        with open(BASELINE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, ensure_ascii=False, indent=4, sort_keys=True)
+        return
+    limit = baselines.get(name)
+    if limit is not None and mean > limit * TOLERANCE:
+        pytest.fail(f"{name}: среднее {mean * 1e6:.1f} мкс, базовое {limit * 1e6:.1f} мкс (допуск x{TOLERANCE})")
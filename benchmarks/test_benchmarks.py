@@ -0,0 +1,174 @@
+import os
+import random
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+@pytest.fixture(scope="module")
+def candidates(game):
+    random.seed(1)
+    alphabet = game.WordValidator.ALPHABET
+    return ["".join(random.choice(alphabet) for _ in range(random.randint(3, 8))) for _ in range(10000)]
+
+def test_validate_word(benchmark, game):
+    validator = game.WordValidator("корзина")
+    assert benchmark(validator.fits, "корзина")
+
+def test_validate_batch(benchmark, game, candidates):
+    validator = game.WordValidator("корзина")
+    result = benchmark(validator.check_many, candidates)
+    assert len(result) == len(candidates)
+
+def test_submit_word(benchmark, game, engine):
+    def submit():
+        engine.level_progress.bits = 0
+        return engine.submit("кино")
+    assert benchmark(submit)[0] == game.GameEngine.ACCEPTED
+
+def test_submit_with_telemetry(benchmark, game, make_engine, save_dir):
+    engine = make_engine(telemetry=game.Telemetry)
+    def submit():
+        engine.level_progress.bits = 0
+        return engine.submit("кино")
+    assert benchmark(submit)[0] == game.GameEngine.ACCEPTED
+    game.Telemetry.flush()
+    assert os.path.exists(game.Telemetry.TELEMETRY_FILE)
+
+def test_load_level(benchmark, game, levels):
+    definitions = levels.definitions
+    def load():
+        return game.LevelList(definitions)[2]
+    assert len(benchmark(load)["words"]) > 0
+
+def test_pack_open_and_decode(benchmark, game, levels, tmp_path):
+    path = str(tmp_path / "уровни.pack")
+    game.LevelPack.write(path, [levels[i % len(levels)] for i in range(10000)])
+    def load():
+        pack = game.LevelPack(path)
+        level = pack[9999]
+        pack.close()
+        return level
+    assert benchmark(load)["required"] == 5
+
+def test_save_load_roundtrip(benchmark, game, make_engine, save_dir):
+    engine = make_engine(store=game.GameSave)
+    for word in ["кино", "роза", "икра"]:
+        engine.submit(word)
+    def roundtrip():
+        game.GameSave.dirty = True
+        engine.save()
+        return game.GameSave.load_progress()
+    assert benchmark(roundtrip)[1]["0"]
+
+def test_profile_load(benchmark, game, save_dir):
+    store = game.ProfileStore(game.ProfileStore.DATABASE_FILE)
+    for n in range(2000):
+        store.select_profile(f"Игрок {n}")
+        store.save_progress(n % 5, {str(level): (1 << 40) - 1 for level in range(5)})
+    def load():
+        store.select_profile(f"Игрок {random.randrange(2000)}")
+        return store.load_progress()
+    assert len(benchmark(load)[1]) == 5
+
+def test_game_window_construction(benchmark, game, gui, levels, save_dir, qapp, monkeypatch):
+    monkeypatch.setattr(game.LevelSource, "default_instance", levels)
+    menu = gui.MainMenu()
+    menu.store = game.ProfileStore(game.ProfileStore.DATABASE_FILE)
+    def build():
+        window = gui.GameWindow(menu)
+        window.start(0)
+        window.hide()
+        window.deleteLater()
+        return window
+    benchmark(build)
+    qapp.processEvents()
+
+def test_game_window_reopen(benchmark, game, gui, levels, save_dir, qapp, monkeypatch):
+    # Открытие игры из меню: окно уже построено и только сбрасывается
+    monkeypatch.setattr(game.LevelSource, "default_instance", levels)
+    menu = gui.MainMenu()
+    menu.store = game.ProfileStore(game.ProfileStore.DATABASE_FILE)
+    window = gui.GameWindow(menu)
+    def reopen():
+        window.start(0)
+        window.return_to_menu()
+    benchmark(reopen)
+    menu.hide()
+    window.deleteLater()
+    qapp.processEvents()
+
+def test_keystroke_feedback(benchmark, game, engine):
+    def type_word():
+        for text in ["к", "ки", "кин", "кино", "кин"]:
+            state = engine.feedback(text)
+        return state
+    assert benchmark(type_word)[0] == game.GameEngine.PREFIX
+
+def test_dictionary_lookup(benchmark, game, candidates, tmp_path):
+    path = str(tmp_path / "существительные.dawg")
+    game.NounDictionary.build(candidates, path)
+    dictionary = game.NounDictionary(path)
+    assert benchmark(dictionary.__contains__, candidates[-1])
+
+def test_catalog_sweep(benchmark, game, candidates):
+    np = pytest.importorskip("numpy")
+    counts, masks = game.CatalogBuilder.encode(candidates)
+    game.CatalogBuilder.init_worker(counts, masks)
+    rows = np.arange(game.CatalogBuilder.CHUNK)
+    assert len(benchmark(game.CatalogBuilder.count_subwords, rows)) == len(rows)
+
+def test_asset_bundle_open(benchmark, game, tmp_path):
+    with open(os.path.join(game.Assets.ROOT, game.Assets.MANIFEST_FILE), 'rb') as f:
+        (tmp_path / game.Assets.MANIFEST_FILE).write_bytes(f.read())
+    game.Assets(game.Assets.ROOT).write_bundle(str(tmp_path / game.Assets.BUNDLE_FILE))
+    def load():
+        assets = game.Assets(str(tmp_path))
+        return [assets.read(name) for name in assets.manifest if name.startswith("backgrounds/")]
+    assert all(benchmark(load))
+
+def test_load_replay(benchmark, game, levels, save_dir):
+    recording = str(save_dir / "load.jsonl")
+    game.LoadTest(levels, players=50, rate=0).run(duration=0.2, record=recording)
+    # Одинаковый объём работы на любой машине
+    with open(recording, 'r', encoding='utf-8') as f:
+        actions = f.readlines()[:2000]
+    with open(recording, 'w', encoding='utf-8') as f:
+        f.writelines(actions)
+    def replay():
+        return game.LoadTest(levels, players=50, rate=0).replay(recording)
+    report = benchmark.pedantic(replay, rounds=5)
+    assert report["actions"] > 0 and report["results"]["accepted"] > 0
+
+def test_suggest(benchmark, engine):
+    assert benchmark(engine.suggest, "корзна")[0] == "корзина"
+
+def test_level_hints(benchmark, engine):
+    # Отгадка слова и запросы к индексу подсказок: остаток по длине и букве, следующая буква
+    words = list(engine.words)
+    def play():
+        engine.guessed_words = {}
+        engine.load_level(0)
+        for word in words:
+            engine.submit(word)
+            engine.remaining(len(word), word[0])
+            engine.hint()
+        return engine.remaining()
+    assert benchmark(play) == 0
+
+def test_level_reload(benchmark, game, levels, make_engine, tmp_path):
+    # Правка одного файла ответов: чередуем две версии, каждый раз применяется разница
+    path = tmp_path / "ответы.txt"
+    words = list(levels[0]["words"])
+    versions = ["\n".join(words), "\n".join(["кинза"] + words[:-1])]
+    path.write_text(versions[0], encoding='utf-8')
+    source = game.LevelList([dict(game.LEVELS[0], file=str(path))])
+    engine = make_engine(source)
+    engine.submit("кино")
+    state = {"version": 0}
+    def reload():
+        state["version"] ^= 1
+        path.write_text(versions[state["version"]], encoding='utf-8')
+        return source.reload(0)
+    assert benchmark(reload)
+    engine.sync()
+    assert "кино" in engine.level_progress
@@ -0,0 +1,2348 @@
+# Логика игры «Слова из слова» без Qt: уровни, проверка слов, прогресс и его хранилища,
+# игровой сервер и нагрузочный прогон. Окно игры - «Игра Слова из слова.py»
+import time
+import argparse
+import asyncio
+import atexit
+import heapq
+import json
+import mmap
+import os
+import random
+import sqlite3
+import struct
+import sys
+import tempfile
+import threading
+import zlib
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+class Profiler:
+    # Замеры горячих участков: SLOVA_PROFILE=1 или ключ --profile. Выключенный профайлер
+    # не оборачивает функции вовсе. Режим cprofile дополнительно профилирует весь цикл событий Qt
+    enabled = bool(os.environ.get("SLOVA_PROFILE")) or any(arg.startswith("--profile") for arg in sys.argv)
+    mode = "cprofile" if os.environ.get("SLOVA_PROFILE") == "cprofile" else "stats"
+    REPORT_FILE = "profile_report.json"
+    CPROFILE_FILE = "profile.prof"
+    stats = {}
+    lock = threading.Lock()
+
+    @classmethod
+    def timed(cls, func):
+        if not cls.enabled:
+            return func
+        name = func.__qualname__
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                cls.record(name, time.perf_counter_ns() - start)
+        wrapper.__name__ = func.__name__
+        wrapper.__qualname__ = name
+        return wrapper
+
+    @classmethod
+    def record(cls, name, elapsed_ns):
+        # Гистограмма по степеням двойки в микросекундах: корзина k - до 2^k мкс
+        bucket = (elapsed_ns // 1000).bit_length()
+        with cls.lock:
+            entry = cls.stats.get(name)
+            if entry is None:
+                entry = cls.stats[name] = {"calls": 0, "total_ns": 0, "max_ns": 0, "buckets": {}}
+            entry["calls"] += 1
+            entry["total_ns"] += elapsed_ns
+            entry["max_ns"] = max(entry["max_ns"], elapsed_ns)
+            entry["buckets"][bucket] = entry["buckets"].get(bucket, 0) + 1
+
+    @classmethod
+    def report(cls):
+        with cls.lock:
+            return {
+                name: {
+                    "calls": entry["calls"],
+                    "total_ms": entry["total_ns"] / 1e6,
+                    "mean_us": entry["total_ns"] / entry["calls"] / 1e3,
+                    "max_us": entry["max_ns"] / 1e3,
+                    "histogram_us": {f"<{1 << k}": n for k, n in sorted(entry["buckets"].items())}
+                }
+                for name, entry in sorted(cls.stats.items())
+            }
+
+    @classmethod
+    def dump(cls):
+        with open(cls.REPORT_FILE, 'w', encoding='utf-8') as f:
+            json.dump(cls.report(), f, ensure_ascii=False, indent=4)
+
+    @classmethod
+    def run_event_loop(cls, app):
+        if not (cls.enabled and cls.mode == "cprofile"):
+            return app.exec_()
+        import cProfile
+        import pstats
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            return app.exec_()
+        finally:
+            profile.disable()
+            profile.dump_stats(cls.CPROFILE_FILE)
+            pstats.Stats(profile).sort_stats("cumulative").print_stats(20)
+
+if Profiler.enabled:
+    atexit.register(Profiler.dump)
+# ==================== Игровая логика ====================
+class WordValidator:
+    # Фиксированный вектор из 33 ячеек: по одной на каждую букву алфавита
+    ALPHABET = "абвгдеёжзийклмнопрстуфхцчшщъыьэюя"
+    INDEX = {letter: i for i, letter in enumerate(ALPHABET)}
+    # Пробельные символы, которые str.strip отбрасывает по краям слова
+    SPACES = frozenset(" \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\x85\xa0\u1680\u2000\u2001\u2002\u2003\u2004\u2005"
+                       "\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000")
+
+    @classmethod
+    def vector(cls, word):
+        counts = [0] * len(cls.ALPHABET)
+        for letter in word:
+            i = cls.INDEX.get(letter)
+            if i is None:
+                return None
+            counts[i] += 1
+        return counts
+
+    def __init__(self, letters):
+        # Буквы уровня приводятся к виду WordIndex.normalize, как и проверяемые слова
+        self.counts = self.vector(WordIndex.normalize("".join(letters))) or [0] * len(self.ALPHABET)
+        self.letters = frozenset(letter for letter in self.ALPHABET if self.counts[self.INDEX[letter]])
+        # Символы, которые после нормализации могут оказаться буквами уровня или будут отброшены
+        self.folded = self.letters | {letter.upper() for letter in self.letters} | self.SPACES
+        if "е" in self.letters:
+            self.folded |= {"ё", "Ё"}
+
+    def fits(self, word):
+        counts = [0] * len(self.ALPHABET)
+        limits = self.counts
+        index = self.INDEX
+        for letter in word:
+            i = index.get(letter)
+            if i is None:
+                return False
+            counts[i] += 1
+            if counts[i] > limits[i]:
+                return False
+        return True
+
+    def check_many(self, words):
+        # Пакетная проверка: сначала дешёвый отсев по множеству символов ещё не нормализованного слова,
+        # затем уцелевшие слова нормализуются так же, как в GameEngine.evaluate, и каждая буква
+        # считается через str.count. Пустые слова не проходят
+        letters = self.letters
+        folded = self.folded
+        limits = self.counts
+        index = self.INDEX
+        normalize = WordIndex.normalize
+        result = []
+        for word in words:
+            if set(word) <= folded:
+                word = normalize(word)
+                used = set(word)
+                result.append(bool(word) and used <= letters
+                              and all(word.count(letter) <= limits[index[letter]] for letter in used))
+            else:
+                result.append(False)
+        return result
+
+    def filter_valid(self, words):
+        return [word for word, ok in zip(words, self.check_many(words)) if ok]
+
+class WordIndex:
+    # Хеш-индекс ответов уровня: нормализованное слово -> каноническое написание
+    def __init__(self, words=()):
+        self.words = []
+        self.lookup = {}
+        self.positions = {}
+        self.hash = None
+        for word in words:
+            self.add(word)
+
+    @staticmethod
+    def normalize(word):
+        # Буквы «Е» и «Ё» взаимозаменяемы
+        return word.strip().lower().replace("ё", "е")
+
+    def add(self, word):
+        canonical = word.strip().lower()
+        key = self.normalize(canonical)
+        if key and key not in self.lookup:
+            self.lookup[key] = canonical
+            self.positions[key] = len(self.words)
+            self.words.append(canonical)
+            self.hash = None
+
+    def update(self, words):
+        # Новый список ответов применяется к этому же объекту. Возвращает новые номера прежних слов
+        # (None - слово удалено), добавленные и удалённые слова
+        new = WordIndex(words)
+        mapping = [new.positions.get(self.normalize(word)) for word in self.words]
+        added = [word for word in new.words if self.normalize(word) not in self.lookup]
+        removed = [word for word in self.words if self.normalize(word) not in new.lookup]
+        self.words, self.lookup, self.positions = new.words, new.lookup, new.positions
+        self.hash = None
+        return mapping, added, removed
+
+    def fingerprint(self):
+        # Отпечаток списка ответов для сохранений: число слов в старших битах, CRC32 нормализованных слов
+        # по порядку в младших. Маска прогресса верна только для списка с тем же отпечатком
+        if self.hash is None:
+            self.hash = len(self.words) << 32 | zlib.crc32("\n".join(self.lookup).encode('utf-8'))
+        return self.hash
+
+    def canonical(self, word):
+        return self.lookup.get(self.normalize(word))
+
+    def position(self, word):
+        return self.positions.get(self.normalize(word))
+
+    def __contains__(self, word):
+        return self.normalize(word) in self.lookup
+
+    def __iter__(self):
+        return iter(self.words)
+
+    def __len__(self):
+        return len(self.words)
+
+class PrefixTrie:
+    # Префиксное дерево ответов уровня; ключ "" в узле хранит каноническое написание слова
+    def __init__(self, words):
+        self.root = {}
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        node = self.root
+        for letter in WordIndex.normalize(word):
+            node = node.setdefault(letter, {})
+        node[""] = word
+
+    def remove(self, word):
+        # Опустевшие узлы удаляются снизу вверх
+        path = [self.root]
+        key = WordIndex.normalize(word)
+        for letter in key:
+            node = path[-1].get(letter)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].pop("", None)
+        for depth in range(len(key), 0, -1):
+            if path[depth]:
+                break
+            del path[depth - 1][key[depth - 1]]
+
+class TrieCursor:
+    # Состояние ввода, которое обновляется по одной букве: узел дерева и счётчики букв
+    # для каждого префикса, поэтому нажатие клавиши стоит O(1)
+    def __init__(self, trie, validator):
+        self.trie = trie
+        self.limits = validator.counts
+        self.counts = [0] * len(WordValidator.ALPHABET)
+        self.text = ""
+        self.nodes = [trie.root]
+        self.letters = []
+        self.over = 0
+
+    def push(self, letter):
+        node = self.nodes[-1]
+        self.nodes.append(node.get(letter) if node is not None else None)
+        i = WordValidator.INDEX.get(letter)
+        self.letters.append(i)
+        if i is None:
+            self.over += 1
+        else:
+            self.counts[i] += 1
+            if self.counts[i] > self.limits[i]:
+                self.over += 1
+
+    def pop(self):
+        self.nodes.pop()
+        i = self.letters.pop()
+        if i is None:
+            self.over -= 1
+        else:
+            if self.counts[i] > self.limits[i]:
+                self.over -= 1
+            self.counts[i] -= 1
+
+    def update(self, text):
+        text = WordIndex.normalize(text)
+        if text[:-1] == self.text and len(text) == len(self.text) + 1:
+            self.push(text[-1])
+        elif text == self.text[:-1] and self.text:
+            self.pop()
+        elif text != self.text:
+            while self.letters:
+                self.pop()
+            for letter in text:
+                self.push(letter)
+        self.text = text
+
+    def is_valid(self):
+        return self.over == 0
+
+    def node(self):
+        return self.nodes[-1]
+
+class SuggestionIndex:
+    # Подсказки «может быть» в духе SymSpell: каждое слово уровня и все его варианты без 1..MAX_DISTANCE
+    # букв ведут на само слово. Запрос порождает такие же удаления из введённого текста, а найденные
+    # кандидаты сверяются точным расстоянием (перестановка соседних букв считается одной правкой)
+    MAX_DISTANCE = 2
+    LIMIT = 3
+
+    def __init__(self, words, max_distance=MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.deletes = {}
+        for word in words:
+            self.add(word)
+
+    def add(self, word):
+        for variant in self.variants(WordIndex.normalize(word)):
+            self.deletes.setdefault(variant, []).append(word)
+
+    def remove(self, word):
+        for variant in self.variants(WordIndex.normalize(word)):
+            words = self.deletes.get(variant)
+            if words is not None and word in words:
+                words.remove(word)
+                if not words:
+                    del self.deletes[variant]
+
+    def variants(self, word):
+        result = {word}
+        frontier = {word}
+        for _ in range(self.max_distance):
+            frontier = {variant[:i] + variant[i + 1:] for variant in frontier for i in range(len(variant))}
+            result |= frontier
+        return result
+
+    @staticmethod
+    def distance(a, b, limit):
+        # Общие начало и конец не влияют на расстояние, обычно после них остаётся одна-две буквы
+        start = 0
+        while start < len(a) and start < len(b) and a[start] == b[start]:
+            start += 1
+        end = 0
+        while end < len(a) - start and end < len(b) - start and a[-1 - end] == b[-1 - end]:
+            end += 1
+        a = a[start:len(a) - end]
+        b = b[start:len(b) - end]
+        if abs(len(a) - len(b)) > limit:
+            return limit + 1
+        if not a or not b:
+            return max(len(a), len(b))
+        previous = None
+        row = list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            before, previous, row = previous, row, [i] + [0] * len(b)
+            for j in range(1, len(b) + 1):
+                cost = a[i - 1] != b[j - 1]
+                row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + cost)
+                if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                    row[j] = min(row[j], before[j - 2] + 1)
+            if min(row) > limit:
+                return limit + 1
+        return row[-1]
+
+    def lookup(self, text, exclude=(), limit=LIMIT):
+        # Ближайшие слова уровня, кроме exclude (уже отгаданных): сначала по расстоянию, затем длинные
+        query = WordIndex.normalize(text)
+        found = {}
+        for variant in self.variants(query):
+            for word in self.deletes.get(variant, ()):
+                if word not in found:
+                    found[word] = self.distance(query, WordIndex.normalize(word), self.max_distance)
+        candidates = [word for word, distance in found.items()
+                      if 0 < distance <= self.max_distance and word not in exclude]
+        candidates.sort(key=lambda word: (found[word], -len(word), word))
+        return candidates[:limit]
+
+class LevelProgress:
+    # Прогресс уровня - битовое множество над индексированным списком ответов.
+    # revision - сколько правок списка ответов (level["changes"]) уже учтено в маске
+    def __init__(self, words, bits=0):
+        self.words = words
+        self.bits = bits
+        self.revision = 0
+
+    @staticmethod
+    def remap(bits, mapping):
+        # Перевод маски на новые номера слов после правки списка ответов
+        result = 0
+        for old, new in enumerate(mapping):
+            if bits >> old & 1 and new is not None:
+                result |= 1 << new
+        return result
+
+    @staticmethod
+    def saved(progress):
+        # Запись для хранилища: (маска, отпечаток списка ответов, сам список); 0 и None - список неизвестен
+        if isinstance(progress, LevelProgress):
+            return progress.bits, progress.words.fingerprint(), progress.words.words
+        if isinstance(progress, tuple):
+            return progress
+        return progress, 0, None
+
+    @classmethod
+    def restore(cls, words, saved):
+        # saved - запись хранилища (см. saved), битовая маска или список слов из старого текстового формата.
+        # Если список ответов с тех пор изменился, отгаданные слова переносятся по написанию, а не по номерам
+        if isinstance(saved, tuple):
+            bits, fingerprint, answers = saved
+            if answers is not None and fingerprint != words.fingerprint():
+                saved = [word for i, word in enumerate(answers) if bits >> i & 1]
+            else:
+                saved = bits
+        if isinstance(saved, int):
+            return cls(words, saved & ((1 << len(words)) - 1))
+        progress = cls(words)
+        for word in saved:
+            progress.add(word)
+        return progress
+
+    def add(self, word):
+        i = self.words.position(word)
+        if i is None or self.bits >> i & 1:
+            return None
+        self.bits |= 1 << i
+        return i
+
+    def add_index(self, i):
+        self.bits |= 1 << i
+
+    def __contains__(self, word):
+        i = self.words.position(word)
+        return i is not None and self.bits >> i & 1 == 1
+
+    def __len__(self):
+        return bin(self.bits).count("1")
+
+    def __iter__(self):
+        bits = self.bits
+        i = 0
+        while bits:
+            if bits & 1:
+                yield self.words.words[i]
+            bits >>= 1
+            i += 1
+
+    def to_bytes(self):
+        return self.bits.to_bytes((len(self.words) + 7) // 8, 'little')
+
+class LevelHints:
+    # Что осталось отгадать на уровне: счётчики по паре (длина, первая буква) и по каждой из них,
+    # плюс подсказка «открыть букву». Полные счётчики списка ответов (count_words) общие для всех, кто
+    # играет уровень; игрок считает только отгаданное, остаток - разность, поэтому и построение,
+    # и отгадка, и запрос стоят O(1) на слово. dump/restore сохраняют рядом с прогрессом счётчики отгаданного
+    # и положение подсказки, чтобы при возвращении на уровень не проходить заново по отгаданным словам
+    def __init__(self, words, progress, totals=None):
+        self.words = words
+        self.totals = totals if totals is not None else self.count_words(words)
+        self.keys = self.totals["keys"]
+        self.bits = 0
+        self.found = 0
+        self.found_both = Counter()
+        self.found_length = Counter()
+        self.found_letter = Counter()
+        if progress is not None:
+            bits = progress.bits
+            i = 0
+            while bits:
+                if bits & 1:
+                    self.guessed(i)
+                bits >>= 1
+                i += 1
+        # Подсказка открывает буквы первого неотгаданного слова по порядку списка ответов
+        self.target = 0
+        self.revealed = 0
+
+    @staticmethod
+    def count_words(words):
+        keys = []
+        for word in words.words:
+            word = WordIndex.normalize(word)
+            keys.append((len(word), word[:1]))
+        return {
+            "keys": keys,
+            "by_both": Counter(keys),
+            "by_length": Counter(length for length, _ in keys),
+            "by_letter": Counter(letter for _, letter in keys)
+        }
+
+    def guessed(self, index):
+        if not self.bits >> index & 1:
+            self.bits |= 1 << index
+            length, letter = self.keys[index]
+            self.found += 1
+            self.found_both[length, letter] += 1
+            self.found_length[length] += 1
+            self.found_letter[letter] += 1
+
+    def left(self, length=None, letter=None):
+        if length is None and letter is None:
+            return len(self.keys) - self.found
+        if letter is None:
+            return self.totals["by_length"][length] - self.found_length[length]
+        letter = WordIndex.normalize(letter)
+        if length is None:
+            return self.totals["by_letter"][letter] - self.found_letter[letter]
+        return self.totals["by_both"][length, letter] - self.found_both[length, letter]
+
+    def breakdown(self):
+        # Ненулевые остатки по длине и по первой букве, по возрастанию
+        lengths = [(length, n - self.found_length[length]) for length, n in sorted(self.totals["by_length"].items())]
+        letters = [(letter, n - self.found_letter[letter]) for letter, n in sorted(self.totals["by_letter"].items())]
+        return [item for item in lengths if item[1]], [item for item in letters if item[1]]
+
+    def hint(self):
+        # Указатель только растёт, поэтому за весь уровень проход по списку один
+        words = self.words.words
+        while self.target < len(words) and self.bits >> self.target & 1:
+            self.target += 1
+            self.revealed = 0
+        if self.target == len(words):
+            return None
+        word = words[self.target]
+        self.revealed = min(self.revealed + 1, len(word))
+        return word[:self.revealed] + "•" * (len(word) - self.revealed)
+
+    def dump(self):
+        return {
+            "fingerprint": self.words.fingerprint(),
+            "found": self.found,
+            "both": [[length, letter, n] for (length, letter), n in self.found_both.items() if n],
+            "target": self.target,
+            "revealed": self.revealed
+        }
+
+    @classmethod
+    def restore(cls, words, progress, data, totals=None):
+        # Сохранённые счётчики годятся, только если список ответов тот же (отпечаток), а после записи
+        # не отгадано ничего нового (число слов в маске); иначе индекс строится заново по маске
+        if data.get("fingerprint") != words.fingerprint() or data.get("found") != len(progress):
+            return None
+        hints = cls(words, None, totals)
+        hints.bits = progress.bits
+        hints.found = data["found"]
+        for length, letter, n in data.get("both", ()):
+            hints.found_both[length, letter] = n
+            hints.found_length[length] += n
+            hints.found_letter[letter] += n
+        hints.target = data.get("target", 0)
+        hints.revealed = data.get("revealed", 0)
+        return hints
+
+class SubwordGenerator:
+    # Словарь существительных, по одному слову в строке (ресурс Assets)
+    DICTIONARY_ASSET = "dictionary/nouns"
+    MIN_LENGTH = 3
+    shared_instance = None
+
+    def __init__(self, words):
+        # Анаграммный индекс: отсортированные буквы слова -> слова из этих букв
+        self.anagrams = {}
+        for word in words:
+            word = word.strip().lower()
+            if len(word) >= self.MIN_LENGTH:
+                self.anagrams.setdefault("".join(sorted(WordIndex.normalize(word))), []).append(word)
+
+    @classmethod
+    def from_file(cls, path):
+        if not os.path.exists(path):
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f)
+
+    @classmethod
+    def shared(cls):
+        assets = Assets.shared()
+        if cls.shared_instance is None and assets.exists(cls.DICTIONARY_ASSET):
+            cls.shared_instance = cls(assets.read_lines(cls.DICTIONARY_ASSET))
+        return cls.shared_instance
+
+    def generate(self, letters):
+        # Перебираем только подмультимножества букв исходного слова (не более 2^n ключей),
+        # а не весь словарь: ключи строятся сразу в отсортированном виде
+        keys = [""]
+        for letter, count in sorted(Counter(WordIndex.normalize("".join(letters))).items()):
+            keys = [key + letter * n for key in keys for n in range(count + 1)]
+        words = set()
+        for key in keys:
+            if len(key) >= self.MIN_LENGTH and key in self.anagrams:
+                words.update(self.anagrams[key])
+        return sorted(words, key=lambda word: (-len(word), word))
+
+class DawgNode:
+    __slots__ = ("edges", "final")
+
+    def __init__(self):
+        self.edges = {}
+        self.final = False
+
+    def signature(self):
+        # Дочерние узлы к этому моменту уже минимизированы, поэтому их можно сравнивать по id
+        return self.final, tuple((letter, id(child)) for letter, child in sorted(self.edges.items()))
+
+class NounDictionary:
+    # Минимальный ациклический автомат (DAWG) словаря существительных в отображаемом в память файле.
+    # Узел - подряд идущие рёбра uint32: биты 0-5 - номер буквы, бит 6 - последнее ребро узла,
+    # бит 7 - слово заканчивается после ребра, биты 8-31 - адрес дочернего узла (0 - нет потомков)
+    DICTIONARY_ASSET = "dictionary/dawg"
+    MAGIC = b"SLVD"
+    VERSION = 1
+    HEADER = struct.Struct("<4sIII")
+    LAST_EDGE = 1 << 6
+    FINAL = 1 << 7
+    # Адрес дочернего узла занимает 24 бита
+    MAX_EDGES = 1 << 24
+    shared_instance = None
+
+    @classmethod
+    def shared(cls):
+        assets = Assets.shared()
+        if cls.shared_instance is None and assets.exists(cls.DICTIONARY_ASSET):
+            cls.shared_instance = cls(data=assets.map(cls.DICTIONARY_ASSET))
+        return cls.shared_instance
+
+    def __init__(self, path=None, data=None):
+        # data - уже отображённый в память словарь (Assets.map), иначе отображается файл path
+        if data is None:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = data
+        magic, version, self.root, count = self.HEADER.unpack_from(self.data)
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError(f"Неизвестный формат словаря: {path or self.DICTIONARY_ASSET}")
+        self.edges = memoryview(self.data)[self.HEADER.size:self.HEADER.size + count * 4].cast("I")
+
+    def __contains__(self, word):
+        edge = self.walk(word)
+        return edge is not None and edge & self.FINAL != 0
+
+    def has_prefix(self, text):
+        # Есть ли в словаре слово, начинающееся с text
+        return self.walk(text) is not None
+
+    def walk(self, word):
+        # Последнее ребро пути по буквам слова (0 - пустое слово), None - такого пути нет
+        edges = self.edges
+        node = self.root
+        edge = 0
+        for letter in WordIndex.normalize(word):
+            i = WordValidator.INDEX.get(letter)
+            if i is None or node == 0:
+                return None
+            while True:
+                edge = edges[node]
+                if edge & 63 == i:
+                    node = edge >> 8
+                    break
+                if edge & self.LAST_EDGE:
+                    return None
+                node += 1
+        return edge
+
+    @classmethod
+    def build(cls, words, path):
+        # Инкрементальное построение минимального автомата по отсортированному списку (Daciuk и др.)
+        words = sorted({WordIndex.normalize(word) for word in words if word.strip()})
+        words = [word for word in words if all(letter in WordValidator.INDEX for letter in word)]
+        root = DawgNode()
+        register = {}
+        unchecked = []
+        previous = ""
+
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, letter, child = unchecked.pop()
+                key = child.signature()
+                if key in register:
+                    parent.edges[letter] = register[key]
+                else:
+                    register[key] = child
+
+        for word in words:
+            common = 0
+            while common < min(len(word), len(previous)) and word[common] == previous[common]:
+                common += 1
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else root
+            for letter in word[common:]:
+                child = DawgNode()
+                node.edges[letter] = child
+                unchecked.append((node, letter, child))
+                node = child
+            node.final = True
+            previous = word
+        minimize(0)
+        # Раскладка узлов в плоский массив обходом в глубину с явным стеком (длинные слова не упираются
+        # в предел рекурсии); адрес 0 занят пустым ребром
+        edges = [0]
+        addresses = {}
+        stack = []
+        def place(node):
+            # Место под рёбра выделяется при первом посещении, сами рёбра заполняет цикл ниже
+            if not node.edges:
+                return 0
+            address = addresses.get(id(node))
+            if address is None:
+                address = addresses[id(node)] = len(edges)
+                items = sorted(node.edges.items())
+                edges.extend([0] * len(items))
+                stack.append((address, items, iter(range(len(items)))))
+            return address
+        root_address = place(root)
+        while stack:
+            address, items, pending = stack[-1]
+            k = next(pending, None)
+            if k is None:
+                stack.pop()
+                continue
+            letter, child = items[k]
+            edge = WordValidator.INDEX[letter] | place(child) << 8
+            if child.final:
+                edge |= cls.FINAL
+            if k == len(items) - 1:
+                edge |= cls.LAST_EDGE
+            edges[address + k] = edge
+        if len(edges) >= cls.MAX_EDGES:
+            raise ValueError(f"Словарь слишком велик: {len(edges)} рёбер, допустимо меньше {cls.MAX_EDGES}")
+        data = cls.HEADER.pack(cls.MAGIC, cls.VERSION, root_address, len(edges)) + struct.pack(f"<{len(edges)}I", *edges)
+        GameSave.write_atomic(path, data)
+        return len(words), len(edges)
+
+class Assets:
+    # Ресурсы ищутся по манифесту assets.json: имя ресурса -> путь относительно папки игры.
+    # Если рядом лежит пакет ресурсов, всё читается из него одним отображённым в память файлом:
+    # заголовок (MAGIC, версия, длина оглавления), оглавление в JSON {имя: [смещение, длина]} и данные
+    ROOT = os.path.dirname(os.path.abspath(__file__))
+    MANIFEST_FILE = "assets.json"
+    BUNDLE_FILE = "ресурсы.bundle"
+    MAGIC = b"SLVB"
+    VERSION = 1
+    HEADER = struct.Struct("<4sBI")
+    ALIGN = 8
+    lock = threading.Lock()
+    shared_instance = None
+
+    @classmethod
+    def shared(cls):
+        with cls.lock:
+            if cls.shared_instance is None:
+                cls.shared_instance = cls(cls.ROOT)
+            return cls.shared_instance
+
+    def __init__(self, root):
+        self.root = root
+        self.manifest = {}
+        manifest_path = os.path.join(root, self.MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        self.data = None
+        self.index = {}
+        bundle_path = os.path.join(root, self.BUNDLE_FILE)
+        if os.path.exists(bundle_path):
+            with open(bundle_path, 'rb') as f:
+                self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, index_size = self.HEADER.unpack_from(self.data)
+            if magic != self.MAGIC or version != self.VERSION:
+                raise ValueError(f"Неизвестный формат пакета ресурсов: {bundle_path}")
+            self.index = json.loads(self.data[self.HEADER.size:self.HEADER.size + index_size].decode('utf-8'))
+
+    def resolve(self, name):
+        # Имя без записи в манифесте считается путём относительно папки игры
+        return os.path.join(self.root, self.manifest.get(name, name))
+
+    def bundled(self, name):
+        return name in self.index
+
+    def exists(self, name):
+        return name in self.index or os.path.exists(self.resolve(name))
+
+    def location(self, name):
+        return f"{self.BUNDLE_FILE}:{name}" if name in self.index else self.resolve(name)
+
+    def read(self, name):
+        if name in self.index:
+            offset, length = self.index[name]
+            return self.data[offset:offset + length]
+        path = self.resolve(name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return f.read()
+
+    def read_lines(self, name):
+        data = self.read(name)
+        return data.decode('utf-8').splitlines() if data is not None else []
+
+    def map(self, name):
+        # Ресурс в памяти без копирования - для наборов уровней и словаря: срез пакета
+        # или отдельно отображённый файл
+        if name in self.index:
+            offset, length = self.index[name]
+            return memoryview(self.data)[offset:offset + length]
+        path = self.resolve(name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def write_bundle(self, path):
+        names = [name for name in self.manifest if os.path.exists(self.resolve(name))]
+        blobs = []
+        for name in names:
+            with open(self.resolve(name), 'rb') as f:
+                blobs.append(f.read())
+        # Смещения зависят от длины оглавления, поэтому оно строится до тех пор, пока длина не перестанет меняться.
+        # Данные выравниваются по ALIGN байт, чтобы отображённый словарь читался массивом uint32
+        index_size = 0
+        while True:
+            offset = self.HEADER.size + index_size
+            index = {}
+            chunks = []
+            for name, blob in zip(names, blobs):
+                padding = -offset % self.ALIGN
+                chunks.append(b"\0" * padding)
+                chunks.append(blob)
+                offset += padding
+                index[name] = [offset, len(blob)]
+                offset += len(blob)
+            encoded = json.dumps(index, ensure_ascii=False).encode('utf-8')
+            if len(encoded) == index_size:
+                break
+            index_size = len(encoded)
+        GameSave.write_atomic(path, b"".join([self.HEADER.pack(self.MAGIC, self.VERSION, index_size), encoded] + chunks))
+        return len(names)
+
+LEVELS = [
+    {
+        "name": "Уровень 1",
+        "letters": ["к", "о", "р", "з", "и", "н", "а"],
+        "file": "answers/1",
+        "required": 5
+    },
+    {
+        "name": "Уровень 2", 
+        "letters": ["п", "а", "р", "о", "в", "о", "з"],
+        "file": "answers/2",
+        "required": 5
+    },
+    {
+        "name": "Уровень 3",
+        "letters": ["к", "а", "р", "т", "и", "н", "а"],
+        "file": "answers/3",
+        "required": 5
+    }
+]
+
+class LevelSource:
+    # Последовательность уровней, каждый из которых декодируется при первом обращении.
+    # Набор уровней (LevelPack) - ресурс Assets; без него уровни берутся из LEVELS
+    PACK_ASSET = "levels/pack"
+    default_instance = None
+
+    @classmethod
+    def default(cls):
+        if cls.default_instance is None:
+            assets = Assets.shared()
+            if assets.exists(cls.PACK_ASSET):
+                cls.default_instance = LevelPack(data=assets.map(cls.PACK_ASSET))
+            else:
+                cls.default_instance = LevelList(LEVELS)
+        return cls.default_instance
+
+    def __init__(self):
+        self.decoded = {}
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        level = self.decoded.get(i)
+        if level is None:
+            level = self.decoded[i] = self.decode(i)
+        return level
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+class LevelList(LevelSource):
+    # Уровни из описаний LEVELS: ответы читаются из файлов уровней и дополняются генератором
+    def __init__(self, definitions):
+        super().__init__()
+        self.definitions = definitions
+
+    def __len__(self):
+        return len(self.definitions)
+
+    def reload(self, i):
+        # Перечитывает файл ответов одного уровня и применяет разницу к уже построенным
+        # структурам уровня; в level["changes"] добавляется перестановка номеров для прогресса игроков,
+        # в level["fingerprints"] - отпечаток списка до этой правки
+        level = self.decoded.get(i)
+        if level is None:
+            return False
+        definition = self.definitions[i]
+        words = self.complete_words(self.load_words(definition["file"]), definition["letters"])
+        fingerprint = level["words"].fingerprint()
+        mapping, added, removed = level["words"].update(words)
+        if not added and not removed and mapping == list(range(len(mapping))):
+            return False
+        for structure in ("trie", "suggestions"):
+            if structure in level:
+                for word in removed:
+                    level[structure].remove(word)
+                for word in added:
+                    level[structure].add(word)
+        # Полные счётчики подсказок пересчитает первый движок, заметивший правку
+        level.pop("hint_totals", None)
+        level.setdefault("changes", []).append(mapping)
+        level.setdefault("fingerprints", []).append(fingerprint)
+        return True
+
+    @Profiler.timed
+    def decode(self, i):
+        definition = self.definitions[i]
+        return {
+            "name": definition["name"],
+            "letters": list(definition["letters"]),
+            "words": self.complete_words(self.load_words(definition["file"]), definition["letters"]),
+            "required": definition["required"]
+        }
+
+    @staticmethod
+    def load_words(name):
+        return WordIndex(Assets.shared().read_lines(name))
+
+    @staticmethod
+    def complete_words(words, letters):
+        # Если есть словарь, список ответов строится автоматически,
+        # а слова из файла уровня только дополняют его
+        generator = SubwordGenerator.shared()
+        if generator is None:
+            return words
+        index = WordIndex(generator.generate(letters))
+        for word in words:
+            index.add(word)
+        return index
+
+class LevelPack(LevelSource):
+    # Файл набора уровней: заголовок (MAGIC, версия, число уровней), таблица смещений
+    # и записи уровней в UTF-8: название, буквы, required, сложность (с версии 2) и ответы,
+    # по одному в строке. Файл отображается в память, открытие не зависит от числа уровней
+    MAGIC = b"SLVP"
+    VERSION = 2
+    HEADER = struct.Struct("<4sBI")
+    ENTRY = struct.Struct("<II")
+
+    def __init__(self, path=None, data=None):
+        # data - уже отображённый в память набор (Assets.map), иначе отображается файл path
+        super().__init__()
+        if data is None:
+            with open(path, 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = data
+        magic, self.version, self.count = self.HEADER.unpack_from(self.data)
+        if magic != self.MAGIC or not 1 <= self.version <= self.VERSION:
+            raise ValueError(f"Неизвестный формат набора уровней: {path or LevelSource.PACK_ASSET}")
+
+    def __len__(self):
+        return self.count
+
+    @Profiler.timed
+    def decode(self, i):
+        offset, length = self.ENTRY.unpack_from(self.data, self.HEADER.size + i * self.ENTRY.size)
+        lines = str(self.data[offset:offset + length], 'utf-8').split("\n")
+        if self.version == 1:
+            lines.insert(3, "0")
+        return {
+            "name": lines[0],
+            "letters": list(lines[1]),
+            "words": WordIndex(lines[4:]),
+            "required": int(lines[2]),
+            "difficulty": float(lines[3])
+        }
+
+    @classmethod
+    def write(cls, path, levels):
+        records = []
+        for level in levels:
+            lines = [level["name"], "".join(level["letters"]), str(level["required"]),
+                     str(level.get("difficulty", 0))] + list(level["words"])
+            records.append("\n".join(lines).encode('utf-8'))
+        offset = cls.HEADER.size + cls.ENTRY.size * len(records)
+        chunks = [cls.HEADER.pack(cls.MAGIC, cls.VERSION, len(records))]
+        for record in records:
+            chunks.append(cls.ENTRY.pack(offset, len(record)))
+            offset += len(record)
+        chunks.extend(records)
+        GameSave.write_atomic(path, b"".join(chunks))
+
+    def close(self):
+        # Срез пакета ресурсов только отпускается, сам пакет остаётся открытым
+        if isinstance(self.data, memoryview):
+            self.data.release()
+        else:
+            self.data.close()
+
+class CatalogBuilder:
+    # Подбор уровней по полному словарю существительных (нужен NumPy). Каждое слово - строка
+    # счётчиков букв и битовая маска его букв. Для каждого кандидата в исходные слова пачкой
+    # считается, сколько слов словаря из него составляется: сначала сравниваются маски букв
+    # сразу со всем словарём, затем счётчики - только у прошедших пар. Пачки считает пул процессов
+    MIN_SOURCE_LENGTH = 7
+    MIN_SUBWORDS = 10
+    # Уровень с EASY_SUBWORDS ответами имеет сложность 0.5; чем меньше ответов, тем сложнее
+    EASY_SUBWORDS = 40
+    REQUIRED_SHARE = 0.3
+    MIN_REQUIRED = 5
+    CHUNK = 32
+    # Данные словаря в процессе пула
+    counts = None
+    masks = None
+
+    @classmethod
+    def encode(cls, words):
+        import numpy as np
+        counts = np.array([WordValidator.vector(word) for word in words], dtype=np.uint8).reshape(len(words), len(WordValidator.ALPHABET))
+        bits = np.uint64(1) << np.arange(len(WordValidator.ALPHABET), dtype=np.uint64)
+        masks = np.bitwise_or.reduce(np.where(counts > 0, bits, np.uint64(0)), axis=1)
+        return counts, masks
+
+    @classmethod
+    def init_worker(cls, counts, masks):
+        cls.counts, cls.masks = counts, masks
+
+    @classmethod
+    def count_subwords(cls, rows):
+        import numpy as np
+        candidate, word = np.nonzero((cls.masks[None, :] & ~cls.masks[rows][:, None]) == 0)
+        fits = (cls.counts[word] <= cls.counts[rows][candidate]).all(axis=1)
+        return np.bincount(candidate[fits], minlength=len(rows))
+
+    @classmethod
+    def subwords(cls, row, words):
+        import numpy as np
+        (found,) = np.nonzero((cls.masks & ~cls.masks[row]) == 0)
+        found = found[(cls.counts[found] <= cls.counts[row]).all(axis=1)]
+        return sorted((words[i] for i in found), key=lambda word: (-len(word), word))
+
+    @classmethod
+    def build(cls, words, levels=100, processes=None):
+        import numpy as np
+        words = sorted({WordIndex.normalize(word) for word in words})
+        words = [word for word in words
+                 if len(word) >= SubwordGenerator.MIN_LENGTH and WordValidator.vector(word) is not None]
+        counts, masks = cls.encode(words)
+        cls.init_worker(counts, masks)
+        lengths = counts.sum(axis=1)
+        candidates = np.flatnonzero(lengths >= cls.MIN_SOURCE_LENGTH)
+        chunks = [candidates[i:i + cls.CHUNK] for i in range(0, len(candidates), cls.CHUNK)]
+        with ProcessPoolExecutor(processes, initializer=cls.init_worker, initargs=(counts, masks)) as pool:
+            results = list(pool.map(cls.count_subwords, chunks, chunksize=16))
+        found = np.concatenate(results) if results else np.zeros(0, dtype=np.int64)
+        # Из анаграмм остаётся одно исходное слово: уровни из одинаковых букв совпадают
+        sources = {}
+        for row, n in zip(candidates.tolist(), found.tolist()):
+            if n >= cls.MIN_SUBWORDS:
+                sources.setdefault("".join(sorted(words[row])), (row, n))
+        # Уровни берутся равномерно по всему диапазону сложности и идут от лёгких к трудным
+        ranked = sorted(sources.values(), key=lambda item: (-item[1], words[item[0]]))
+        step = max(1, len(ranked) / levels)
+        selected = [ranked[int(i * step)] for i in range(min(levels, len(ranked)))]
+        catalog = []
+        for number, (row, n) in enumerate(selected, 1):
+            answers = cls.subwords(row, words)
+            catalog.append({
+                "name": f"Уровень {number}",
+                "letters": list(words[row]),
+                "words": WordIndex(answers),
+                "required": max(cls.MIN_REQUIRED, round(len(answers) * cls.REQUIRED_SHARE)),
+                "difficulty": round(cls.EASY_SUBWORDS / (cls.EASY_SUBWORDS + len(answers)), 3)
+            })
+        return catalog
+
+class GameSave:
+    # Двоичный формат: заголовок MAGIC, версия, текущий уровень, число уровней,
+    # затем по каждому уровню: номер, отпечаток списка ответов, длина маски в байтах и сама битовая маска;
+    # в конце - списки ответов, на которые ссылаются непустые маски (по ним прогресс переносится по словам,
+    # если файл ответов уровня с тех пор правили). Версия 1 - то же без отпечатков и списков
+    SAVE_FILE = "game_save.dat"
+    LEGACY_SAVE_FILE = "game_save.txt"
+    MAGIC = b"SLVS"
+    VERSION = 2
+    HEADER = struct.Struct("<4sBHH")
+    RECORD_V1 = struct.Struct("<HH")
+    RECORD = struct.Struct("<HQH")
+    ANSWERS = struct.Struct("<QI")
+    # Журнал дописывается по одной строке на отгаданное слово и сворачивается в SAVE_FILE при выходе.
+    # Список ответов попадает в журнал строкой answers перед первым словом с его отпечатком
+    JOURNAL_FILE = "game_save.journal"
+    # Индексы подсказок уровней (LevelHints.dump) в JSON: {уровень: данные}
+    HINTS_FILE = "game_save.hints"
+    FLUSH_DELAY = 0.5
+    lock = threading.RLock()
+    pending = []
+    flush_timer = None
+    dirty = True
+    saved_level = None
+    saved_fingerprints = None
+    # Списки ответов по отпечаткам и те из них, что уже есть в SAVE_FILE или журнале
+    answers = {}
+    stored_answers = set()
+    hints = None
+    hints_dirty = False
+
+    @classmethod
+    def record_word(cls, level, index, words):
+        fingerprint = words.fingerprint()
+        with cls.lock:
+            if fingerprint not in cls.stored_answers:
+                cls.answers[fingerprint] = words.words
+                cls.stored_answers.add(fingerprint)
+                cls.pending.append(f"answers:{fingerprint}:{','.join(words.words)}\n")
+            cls.pending.append(f"word:{level}:{index}:{fingerprint}\n")
+            cls.dirty = True
+            cls.schedule_flush()
+
+    @classmethod
+    def record_level(cls, level):
+        with cls.lock:
+            # Подряд идущие смены уровня схлопываются в одну запись
+            if cls.pending and cls.pending[-1].startswith("level:"):
+                cls.pending.pop()
+            cls.pending.append(f"level:{level}\n")
+            cls.dirty = True
+            cls.schedule_flush()
+
+    @classmethod
+    def schedule_flush(cls):
+        if cls.flush_timer is None:
+            cls.flush_timer = threading.Timer(cls.FLUSH_DELAY, cls.flush)
+            cls.flush_timer.daemon = True
+            cls.flush_timer.start()
+
+    @classmethod
+    def cancel_flush(cls):
+        if cls.flush_timer is not None:
+            cls.flush_timer.cancel()
+            cls.flush_timer = None
+
+    @classmethod
+    @Profiler.timed
+    def flush(cls):
+        with cls.lock:
+            cls.flush_timer = None
+            cls.write_hints()
+            if not cls.pending:
+                return
+            lines, cls.pending = cls.pending, []
+            with open(cls.JOURNAL_FILE, 'a', encoding='utf-8') as f:
+                f.write("".join(lines))
+
+    @classmethod
+    def load_hints(cls, level):
+        with cls.lock:
+            if cls.hints is None:
+                cls.hints = {}
+                if os.path.exists(cls.HINTS_FILE):
+                    try:
+                        with open(cls.HINTS_FILE, 'r', encoding='utf-8') as f:
+                            cls.hints = json.load(f)
+                    except (OSError, ValueError):
+                        pass
+            return cls.hints.get(str(level))
+
+    @classmethod
+    def save_hints(cls, level, data):
+        with cls.lock:
+            cls.load_hints(level)
+            if cls.hints.get(str(level)) != data:
+                cls.hints[str(level)] = data
+                cls.hints_dirty = True
+                cls.schedule_flush()
+
+    @classmethod
+    def write_hints(cls):
+        if cls.hints_dirty:
+            cls.write_atomic(cls.HINTS_FILE, json.dumps(cls.hints, ensure_ascii=False).encode('utf-8'))
+            cls.hints_dirty = False
+
+    @classmethod
+    def write_atomic(cls, path, data):
+        temp_path = path + ".tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+
+    @classmethod
+    @Profiler.timed
+    def save_progress(cls, level, guessed_words):
+        # Полная запись (сжатие журнала): при выходе в меню и закрытии окна
+        with cls.lock:
+            # Уровни, на которые в этой сессии не заходили, остаются записями из load_progress
+            records = {lvl: LevelProgress.saved(progress) for lvl, progress in guessed_words.items()}
+            fingerprints = {lvl: record[1] for lvl, record in records.items()}
+            if not cls.dirty and level == cls.saved_level and fingerprints == cls.saved_fingerprints:
+                return
+            cls.cancel_flush()
+            cls.pending = []
+            cls.write_hints()
+            chunks = [cls.HEADER.pack(cls.MAGIC, cls.VERSION, level, len(records))]
+            answers = {}
+            for lvl, (bits, fingerprint, words) in records.items():
+                data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+                chunks.append(cls.RECORD.pack(int(lvl), fingerprint, len(data)))
+                chunks.append(data)
+                if bits and words is not None:
+                    answers[fingerprint] = words
+            chunks.append(struct.pack("<H", len(answers)))
+            for fingerprint, words in answers.items():
+                data = "\n".join(words).encode('utf-8')
+                chunks.append(cls.ANSWERS.pack(fingerprint, len(data)))
+                chunks.append(data)
+            cls.write_atomic(cls.SAVE_FILE, b"".join(chunks))
+            for path in (cls.JOURNAL_FILE, cls.LEGACY_SAVE_FILE):
+                if os.path.exists(path):
+                    os.remove(path)
+            cls.answers.update(answers)
+            cls.stored_answers = set(answers)
+            cls.dirty = False
+            cls.saved_level = level
+            cls.saved_fingerprints = fingerprints
+
+    @classmethod
+    def load_progress(cls):
+        # Значения словаря - записи (маска, отпечаток, список ответов), см. LevelProgress.saved;
+        # для старого текстового сохранения - списки слов, которые GameEngine переводит в маски
+        cls.flush()
+        with cls.lock:
+            cls.answers = {}
+            cls.stored_answers = set()
+            if os.path.exists(cls.SAVE_FILE):
+                current_level, guessed_words = cls.load_binary()
+            else:
+                current_level, guessed_words = cls.load_legacy()
+            if os.path.exists(cls.JOURNAL_FILE):
+                with open(cls.JOURNAL_FILE, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        # Недописанная при сбое последняя строка пропускается
+                        if not line.endswith("\n"):
+                            break
+                        parts = line.strip().split(":")
+                        if parts[0] == "level" and len(parts) == 2:
+                            current_level = int(parts[1])
+                        elif parts[0] == "answers" and len(parts) == 3:
+                            cls.answers[int(parts[1])] = parts[2].split(",") if parts[2] else []
+                            cls.stored_answers.add(int(parts[1]))
+                        elif parts[0] == "word" and len(parts) in (3, 4):
+                            saved = guessed_words.get(parts[1], (0, 0))
+                            if isinstance(saved, tuple):
+                                # Строки журнала версии 1 - без отпечатка
+                                fingerprint = int(parts[3]) if len(parts) == 4 else saved[1]
+                                guessed_words[parts[1]] = (saved[0] | 1 << int(parts[2]), fingerprint)
+            guessed_words = {lvl: (saved[0], saved[1], cls.answers.get(saved[1])) if isinstance(saved, tuple) else saved
+                             for lvl, saved in guessed_words.items()}
+            return current_level, guessed_words
+
+    @classmethod
+    def load_binary(cls):
+        with open(cls.SAVE_FILE, 'rb') as f:
+            data = f.read()
+        if len(data) < cls.HEADER.size:
+            return 0, {}
+        magic, version, current_level, count = cls.HEADER.unpack_from(data)
+        if magic != cls.MAGIC or version not in (1, cls.VERSION):
+            return 0, {}
+        guessed_words = {}
+        offset = cls.HEADER.size
+        for _ in range(count):
+            if version == 1:
+                lvl, size = cls.RECORD_V1.unpack_from(data, offset)
+                fingerprint = 0
+                offset += cls.RECORD_V1.size
+            else:
+                lvl, fingerprint, size = cls.RECORD.unpack_from(data, offset)
+                offset += cls.RECORD.size
+            guessed_words[str(lvl)] = (int.from_bytes(data[offset:offset + size], 'little'), fingerprint)
+            offset += size
+        if version > 1:
+            count, = struct.unpack_from("<H", data, offset)
+            offset += 2
+            for _ in range(count):
+                fingerprint, size = cls.ANSWERS.unpack_from(data, offset)
+                offset += cls.ANSWERS.size
+                text = data[offset:offset + size].decode('utf-8')
+                cls.answers[fingerprint] = text.split("\n") if text else []
+                cls.stored_answers.add(fingerprint)
+                offset += size
+        return current_level, guessed_words
+
+    @classmethod
+    def load_legacy(cls):
+        if not os.path.exists(cls.LEGACY_SAVE_FILE):
+            return 0, {}
+        with open(cls.LEGACY_SAVE_FILE, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+        current_level = 0
+        guessed_words = {}
+        reading_words = False
+        for line in lines:
+            line = line.strip()
+            if line.startswith("current_level:"):
+                current_level = int(line.split(":")[1])
+            elif line == "guessed_words:":
+                reading_words = True
+            elif reading_words and ":" in line:
+                lvl, words = line.split(":")
+                guessed_words[lvl] = words.split(",") if words else []  
+        return current_level, guessed_words
+
+    @classmethod
+    def reset_progress(cls):
+        with cls.lock:
+            cls.cancel_flush()
+            cls.pending = []
+            cls.dirty = True
+            cls.stored_answers = set()
+            cls.hints = {}
+            cls.hints_dirty = False
+            for path in (cls.SAVE_FILE, cls.JOURNAL_FILE, cls.LEGACY_SAVE_FILE, cls.HINTS_FILE):
+                if os.path.exists(path):
+                    os.remove(path)
+
+atexit.register(GameSave.flush)
+
+class ProfileStore:
+    # Прогресс многих игроков в SQLite (режим WAL): по строке на (профиль, уровень) с битовой маской.
+    # Интерфейс тот же, что у GameSave; записи копятся и пишутся одной транзакцией,
+    # а прочитанный прогресс профиля кешируется для стартового диалога и окна игры
+    DATABASE_FILE = "profiles.db"
+    DEFAULT_PROFILE = "Игрок"
+    FLUSH_DELAY = 0.5
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS profiles (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            current_level INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS progress (
+            profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+            level INTEGER NOT NULL,
+            bits BLOB NOT NULL,
+            fingerprint INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (profile_id, level)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS answers (
+            fingerprint INTEGER PRIMARY KEY,
+            words TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS hints (
+            profile_id INTEGER NOT NULL REFERENCES profiles(id) ON DELETE CASCADE,
+            level INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (profile_id, level)
+        ) WITHOUT ROWID;
+    """
+    shared_instance = None
+
+    @classmethod
+    def shared(cls):
+        if cls.shared_instance is None:
+            cls.shared_instance = cls(cls.DATABASE_FILE)
+            atexit.register(cls.shared_instance.flush)
+        return cls.shared_instance
+
+    def __init__(self, path, profile=DEFAULT_PROFILE, shared=None):
+        # shared - другое хранилище той же базы: соединение, блокировка и списки ответов общие,
+        # а профиль, кеш и очередь записи свои (несколько игроков в одном процессе, LoadTest)
+        if shared is not None:
+            self.connection = shared.connection
+            self.lock = shared.lock
+            self.answers = shared.answers
+        else:
+            self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            self.connection.execute("PRAGMA foreign_keys=ON")
+            self.connection.executescript(self.SCHEMA)
+            # Базы, созданные до появления отпечатков списков ответов
+            if "fingerprint" not in [row[1] for row in self.connection.execute("PRAGMA table_info(progress)")]:
+                self.connection.execute("ALTER TABLE progress ADD COLUMN fingerprint INTEGER NOT NULL DEFAULT 0")
+            self.lock = threading.RLock()
+            # Списки ответов по отпечаткам (общие для всех профилей)
+            self.answers = {}
+        self.flush_timer = None
+        self.pending_levels = set()
+        self.pending_current = False
+        self.pending_hints = {}
+        self.pending_answers = set()
+        first_run = shared is None and self.connection.execute("SELECT COUNT(*) FROM profiles").fetchone()[0] == 0
+        self.select_profile(profile)
+        if first_run:
+            self.import_game_save()
+
+    def profiles(self):
+        return [row[0] for row in self.connection.execute("SELECT name FROM profiles ORDER BY name")]
+
+    def select_profile(self, name):
+        with self.lock:
+            self.flush()
+            self.connection.execute("INSERT OR IGNORE INTO profiles (name) VALUES (?)", (name,))
+            self.profile_id = self.connection.execute("SELECT id FROM profiles WHERE name = ?", (name,)).fetchone()[0]
+            self.profile = name
+            self.cache = None
+            self.hints_cache = {}
+
+    def load_cache(self):
+        if self.cache is None:
+            current_level = self.connection.execute(
+                "SELECT current_level FROM profiles WHERE id = ?", (self.profile_id,)).fetchone()[0]
+            rows = self.connection.execute(
+                "SELECT level, bits, fingerprint FROM progress WHERE profile_id = ?", (self.profile_id,))
+            self.cache = [current_level, {str(level): (int.from_bytes(bits, 'little'), fingerprint)
+                                          for level, bits, fingerprint in rows}]
+            for fingerprint, words in self.connection.execute(
+                    "SELECT fingerprint, words FROM answers WHERE fingerprint IN "
+                    "(SELECT fingerprint FROM progress WHERE profile_id = ?)", (self.profile_id,)):
+                self.answers[fingerprint] = words.split("\n") if words else []
+        return self.cache
+
+    def import_game_save(self):
+        # Перенос прогресса из game_save.dat / game_save.txt в профиль по умолчанию
+        current_level, guessed_words = GameSave.load_progress()
+        if not guessed_words and current_level == 0:
+            return
+        levels = LevelSource.default()
+        progress = {}
+        for lvl, saved in guessed_words.items():
+            if isinstance(saved, list):
+                if not 0 <= int(lvl) < len(levels):
+                    continue
+                saved = LevelProgress.restore(levels[int(lvl)]["words"], saved).bits
+            progress[lvl] = saved
+        self.save_progress(current_level, progress)
+        GameSave.reset_progress()
+
+    def load_hints(self, level):
+        # Прочитанные и записанные индексы подсказок кешируются, неизменённые не переписываются
+        with self.lock:
+            if str(level) not in self.hints_cache:
+                row = self.connection.execute(
+                    "SELECT data FROM hints WHERE profile_id = ? AND level = ?", (self.profile_id, level)).fetchone()
+                self.hints_cache[str(level)] = json.loads(row[0]) if row else None
+            return self.hints_cache[str(level)]
+
+    def save_hints(self, level, data):
+        with self.lock:
+            if self.load_hints(level) != data:
+                self.hints_cache[str(level)] = self.pending_hints[str(level)] = data
+                self.schedule_flush()
+
+    def record_word(self, level, index, words):
+        with self.lock:
+            cache = self.load_cache()
+            fingerprint = words.fingerprint()
+            cache[1][str(level)] = (cache[1].get(str(level), (0, 0))[0] | 1 << index, fingerprint)
+            self.add_answers(fingerprint, words.words)
+            self.pending_levels.add(str(level))
+            self.schedule_flush()
+
+    def add_answers(self, fingerprint, words):
+        if words is not None and fingerprint not in self.answers:
+            self.answers[fingerprint] = words
+            self.pending_answers.add(fingerprint)
+
+    def record_level(self, level):
+        with self.lock:
+            self.load_cache()[0] = level
+            self.pending_current = True
+            self.schedule_flush()
+
+    def schedule_flush(self):
+        if self.flush_timer is None:
+            self.flush_timer = threading.Timer(self.FLUSH_DELAY, self.flush)
+            self.flush_timer.daemon = True
+            self.flush_timer.start()
+
+    @Profiler.timed
+    def flush(self):
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            if not self.pending_levels and not self.pending_current and not self.pending_hints:
+                return
+            current_level, progress = self.load_cache()
+            rows = []
+            for lvl in self.pending_levels:
+                bits, fingerprint = progress[lvl]
+                rows.append((self.profile_id, int(lvl), bits.to_bytes((bits.bit_length() + 7) // 8, 'little'),
+                             fingerprint))
+            answers = [(fingerprint, "\n".join(self.answers[fingerprint])) for fingerprint in self.pending_answers]
+            hints = [(self.profile_id, int(lvl), json.dumps(data, ensure_ascii=False))
+                     for lvl, data in self.pending_hints.items()]
+            with self.connection:
+                self.connection.execute("BEGIN")
+                self.connection.executemany("INSERT OR IGNORE INTO answers (fingerprint, words) VALUES (?, ?)", answers)
+                self.connection.executemany(
+                    "INSERT INTO progress (profile_id, level, bits, fingerprint) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (profile_id, level) DO UPDATE SET bits = excluded.bits, "
+                    "fingerprint = excluded.fingerprint", rows)
+                self.connection.executemany(
+                    "INSERT INTO hints (profile_id, level, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT (profile_id, level) DO UPDATE SET data = excluded.data", hints)
+                self.connection.execute(
+                    "UPDATE profiles SET current_level = ? WHERE id = ?", (current_level, self.profile_id))
+            self.pending_levels = set()
+            self.pending_current = False
+            self.pending_hints = {}
+            self.pending_answers = set()
+
+    def save_progress(self, level, guessed_words):
+        with self.lock:
+            cache = self.load_cache()
+            for lvl, progress in guessed_words.items():
+                bits, fingerprint, words = LevelProgress.saved(progress)
+                if cache[1].get(lvl) != (bits, fingerprint):
+                    cache[1][lvl] = (bits, fingerprint)
+                    self.pending_levels.add(lvl)
+                    if bits:
+                        self.add_answers(fingerprint, words)
+            if cache[0] != level:
+                cache[0] = level
+                self.pending_current = True
+            self.flush()
+
+    def remap_level(self, level, mapping, fingerprint, words):
+        # Файл ответов уровня перечитан на лету: маски всех профилей, снятые со списка fingerprint
+        # или без отпечатка (старые базы), переводятся на новые номера одной транзакцией
+        with self.lock:
+            self.flush()
+            new_fingerprint = words.fingerprint()
+            rows = self.connection.execute(
+                "SELECT profile_id, bits FROM progress WHERE level = ? AND fingerprint IN (0, ?)",
+                (level, fingerprint)).fetchall()
+            updates = []
+            for profile_id, bits in rows:
+                bits = LevelProgress.remap(int.from_bytes(bits, 'little'), mapping)
+                updates.append((bits.to_bytes((bits.bit_length() + 7) // 8, 'little'), new_fingerprint, profile_id, level))
+                if profile_id == self.profile_id and self.cache is not None:
+                    self.cache[1][str(level)] = (bits, new_fingerprint)
+            if not updates:
+                return
+            self.answers[new_fingerprint] = words.words
+            with self.connection:
+                self.connection.execute("BEGIN")
+                self.connection.execute("INSERT OR IGNORE INTO answers (fingerprint, words) VALUES (?, ?)",
+                                        (new_fingerprint, "\n".join(words.words)))
+                self.connection.executemany(
+                    "UPDATE progress SET bits = ?, fingerprint = ? WHERE profile_id = ? AND level = ?", updates)
+
+    def load_progress(self):
+        with self.lock:
+            current_level, progress = self.load_cache()
+            return current_level, {lvl: (bits, fingerprint, self.answers.get(fingerprint))
+                                   for lvl, (bits, fingerprint) in progress.items()}
+
+    def reset_progress(self):
+        with self.lock:
+            self.pending_levels = set()
+            self.pending_current = False
+            self.pending_hints = {}
+            self.hints_cache = {}
+            with self.connection:
+                self.connection.execute("BEGIN")
+                self.connection.execute("DELETE FROM progress WHERE profile_id = ?", (self.profile_id,))
+                self.connection.execute("DELETE FROM hints WHERE profile_id = ?", (self.profile_id,))
+                self.connection.execute("UPDATE profiles SET current_level = 0 WHERE id = ?", (self.profile_id,))
+            self.cache = [0, {}]
+
+class Telemetry:
+    # Ход игры для настройки сложности уровней: попытки (результат, слово, время с прошлой отгадки)
+    # и переходы между уровнями. Запись - только добавление в ограниченное кольцо в памяти, без
+    # блокировок и ввода-вывода; фоновый поток раз в FLUSH_INTERVAL дописывает накопленное одной
+    # пачкой в TELEMETRY_FILE. Строка на событие: время, событие, уровень, результат, слово, мс;
+    # если кольцо переполнялось, пачку завершает строка dropped с числом потерянных событий в поле результата
+    TELEMETRY_FILE = "telemetry.log"
+    CAPACITY = 10000
+    FLUSH_INTERVAL = 2.0
+    ATTEMPT = "attempt"
+    LEVEL = "level"
+    DROPPED = "dropped"
+    events = deque(maxlen=CAPACITY)
+    # События, вытесненные из заполненного кольца до записи
+    dropped = 0
+    lock = threading.Lock()
+    wakeup = threading.Event()
+    thread = None
+
+    @classmethod
+    def record(cls, event, level, result, word="", elapsed=0.0):
+        if len(cls.events) >= cls.CAPACITY // 2:
+            if len(cls.events) == cls.CAPACITY:
+                cls.dropped += 1
+            cls.wakeup.set()
+        cls.events.append((time.time(), event, level, result, word, elapsed))
+        if cls.thread is None:
+            cls.start()
+
+    @classmethod
+    def start(cls):
+        with cls.lock:
+            if cls.thread is None:
+                cls.thread = threading.Thread(target=cls.run, name="telemetry", daemon=True)
+                cls.thread.start()
+
+    @classmethod
+    def run(cls):
+        while True:
+            cls.wakeup.wait(cls.FLUSH_INTERVAL)
+            cls.wakeup.clear()
+            cls.flush()
+
+    @classmethod
+    def flush(cls):
+        with cls.lock:
+            batch = []
+            while cls.events:
+                batch.append(cls.events.popleft())
+            dropped, cls.dropped = cls.dropped, 0
+            if dropped:
+                batch.append((time.time(), cls.DROPPED, -1, dropped, "", 0.0))
+            if not batch:
+                return
+            with open(cls.TELEMETRY_FILE, 'a', encoding='utf-8') as f:
+                f.write("".join(f"{moment:.3f}\t{event}\t{level}\t{result}\t{word}\t{elapsed * 1000:.0f}\n"
+                                for moment, event, level, result, word, elapsed in batch))
+
+    @classmethod
+    def aggregate(cls, path, levels=None):
+        # Сводка по уровням: попытки по результатам, переходы, медиана времени до отгадки,
+        # отгадки по словам, ответы, которые никто не нашёл, и самые частые слова не из списка;
+        # под ключом dropped - сколько событий потеряно при переполнении кольца
+        stats = {}
+        dropped = 0
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) != 6:
+                    continue
+                _, event, level, result, word, elapsed = fields
+                if event == cls.DROPPED:
+                    dropped += int(result)
+                    continue
+                entry = stats.setdefault(level, {"attempts": 0, "results": {}, "transitions": 0, "times": {}, "rejected": Counter()})
+                if event == cls.LEVEL:
+                    entry["transitions"] += 1
+                    continue
+                entry["attempts"] += 1
+                entry["results"][result] = entry["results"].get(result, 0) + 1
+                if result == GameEngine.ACCEPTED:
+                    entry["times"].setdefault(word, []).append(int(elapsed))
+                elif result == GameEngine.NOT_IN_LIST:
+                    entry["rejected"][word] += 1
+        report = {}
+        for level, entry in sorted(stats.items(), key=lambda item: int(item[0])):
+            times = sorted(t for word_times in entry["times"].values() for t in word_times)
+            summary = report[level] = {
+                "attempts": entry["attempts"],
+                "transitions": entry["transitions"],
+                "results": entry["results"],
+                "median_guess_ms": times[len(times) // 2] if times else None,
+                "words": {
+                    word: {"guessed": len(word_times), "median_ms": sorted(word_times)[len(word_times) // 2]}
+                    for word, word_times in sorted(entry["times"].items(), key=lambda item: -len(item[1]))
+                },
+                "top_rejected": entry["rejected"].most_common(20)
+            }
+            if levels is not None and 0 <= int(level) < len(levels):
+                summary["missed"] = [word for word in levels[int(level)]["words"] if word not in entry["times"]]
+        if dropped:
+            report["dropped"] = dropped
+        return report
+
+atexit.register(Telemetry.flush)
+
+class GameEngine:
+    # Правила игры без Qt: проверка слов, прогресс и переходы между уровнями.
+    # store - хранилище прогресса (по умолчанию GameSave), None - только в памяти;
+    # telemetry - журнал попыток и переходов (Telemetry), None - не записывать
+    EMPTY = "empty"
+    INVALID_LETTERS = "invalid_letters"
+    NOT_IN_LIST = "not_in_list"
+    DUPLICATE = "duplicate"
+    ACCEPTED = "accepted"
+    # Слово из словаря существительных, которого нет в списке уровня
+    BONUS = "bonus"
+    # Состояния подсказки при наборе слова
+    PREFIX = "prefix"
+    DEAD_END = "dead_end"
+    COMPLETE = "complete"
+
+    def __init__(self, levels=None, store=GameSave, dictionary=None, telemetry=None):
+        self.levels = levels if levels is not None else LevelSource.default()
+        self.store = store
+        self.telemetry = telemetry
+        self.dictionary = dictionary if dictionary is not None else NounDictionary.shared()
+        self.current_level = 0
+        self.guessed_words = {}
+        # Бонусные слова хранятся только в текущей сессии и не идут в зачёт уровня
+        self.bonus_words = {}
+        self.level = None
+        self.hints = None
+
+    def restore(self, start_level=0):
+        saved_level = 0
+        self.guessed_words = {}
+        self.bonus_words = {}
+        self.hints = None
+        # Правки списков ответов, уже учтённые в прогрессе из хранилища
+        self.base_revisions = {i: len(level.get("changes", ())) for i, level in self.levels.decoded.items()}
+        if self.store is not None:
+            # Маски уровней превращаются в LevelProgress только при первом заходе на уровень
+            saved_level, self.guessed_words = self.store.load_progress()
+            # Старое текстовое сохранение сразу переписываем в двоичном формате
+            legacy = [lvl for lvl, saved in self.guessed_words.items() if isinstance(saved, list)]
+            for lvl in legacy:
+                if 0 <= int(lvl) < len(self.levels):
+                    self.guessed_words[lvl] = LevelProgress.restore(self.levels[int(lvl)]["words"], self.guessed_words[lvl])
+                else:
+                    del self.guessed_words[lvl]
+            if legacy:
+                self.store.save_progress(start_level or saved_level, self.guessed_words)
+        self.load_level(start_level or saved_level)
+        self.record_transition("start")
+        return self.level
+
+    def load_level(self, number):
+        self.save_hints()
+        self.current_level = max(0, min(number, len(self.levels) - 1))
+        self.level = self.levels[self.current_level]
+        self.words = self.level["words"]
+        self.required = self.level["required"]
+        # Проверяющий вектор, индекс подсказок и префиксное дерево общие для всех, кто играет этот уровень
+        if "validator" not in self.level:
+            self.level["validator"] = WordValidator(self.level["letters"])
+        self.validator = self.level["validator"]
+        if "suggestions" not in self.level:
+            self.level["suggestions"] = SuggestionIndex(self.words)
+        if "hint_totals" not in self.level:
+            self.level["hint_totals"] = LevelHints.count_words(self.words)
+        self.cursor = None
+        self.level_started = self.last_guess = time.monotonic()
+        self.level_progress = self.progress_of(self.current_level)
+        self.revision = self.level_progress.revision
+        self.hints = None
+        if self.store is not None:
+            saved = self.store.load_hints(self.current_level)
+            if saved is not None:
+                self.hints = LevelHints.restore(self.words, self.level_progress, saved, self.level["hint_totals"])
+        if self.hints is None:
+            self.hints = LevelHints(self.words, self.level_progress, self.level["hint_totals"])
+        return self.level
+
+    def save_hints(self):
+        if self.store is not None and self.hints is not None:
+            self.store.save_hints(self.current_level, self.hints.dump())
+
+    def progress_of(self, number):
+        # Прогресс уровня с учётом правок списка ответов, сделанных после загрузки (WordListWatcher)
+        level = self.levels[number]
+        changes = level.get("changes", ())
+        progress = self.guessed_words.get(str(number), 0)
+        if not isinstance(progress, LevelProgress):
+            # Запись со списком ответов переносится по словам (LevelProgress.restore); маску без списка
+            # считаем снятой до правок, сделанных после restore
+            bits, fingerprint, answers = LevelProgress.saved(progress)
+            if answers is None:
+                for mapping in changes[self.base_revisions.get(number, 0):]:
+                    bits = LevelProgress.remap(bits, mapping)
+                progress = bits
+            progress = self.guessed_words[str(number)] = LevelProgress.restore(level["words"], progress)
+            progress.revision = len(changes)
+            # Записи хранилища со старым отпечатком сразу переписываются, чтобы новые номера
+            # из record_word не легли на маску в старой нумерации
+            if bits and fingerprint != level["words"].fingerprint() and self.store is not None:
+                self.store.save_progress(self.current_level, self.guessed_words)
+        elif progress.revision < len(changes):
+            for mapping in changes[progress.revision:]:
+                progress.bits = LevelProgress.remap(progress.bits, mapping)
+            progress.revision = len(changes)
+        return progress
+
+    def sync(self):
+        # Список ответов текущего уровня сменился на лету: маска переводится на новые номера,
+        # курсор подсказки строится заново
+        revision = len(self.level.get("changes", ()))
+        if self.revision != revision:
+            self.revision = revision
+            self.level_progress = self.progress_of(self.current_level)
+            self.cursor = None
+            if "hint_totals" not in self.level:
+                self.level["hint_totals"] = LevelHints.count_words(self.words)
+            self.hints = LevelHints(self.words, self.level_progress, self.level["hint_totals"])
+
+    @Profiler.timed
+    def submit(self, text):
+        # Возвращает результат проверки и слово (для принятого - в каноническом написании)
+        result, word = self.evaluate(text)
+        if self.telemetry is not None and result != self.EMPTY:
+            now = time.monotonic()
+            self.telemetry.record(Telemetry.ATTEMPT, self.current_level, result, word, now - self.last_guess)
+            if result == self.ACCEPTED:
+                self.last_guess = now
+        return result, word
+
+    def record_transition(self, reason):
+        if self.telemetry is not None:
+            self.telemetry.record(Telemetry.LEVEL, self.current_level, reason, "", time.monotonic() - self.level_started)
+
+    def evaluate(self, text):
+        self.sync()
+        word = text.strip().lower()
+        if not word:
+            return self.EMPTY, word
+        if not self.validator.fits(WordIndex.normalize(word)):
+            return self.INVALID_LETTERS, word
+        canonical = self.words.canonical(word)
+        if canonical is None:
+            if self.dictionary is not None and word in self.dictionary:
+                bonus = self.bonus_words.setdefault(self.current_level, set())
+                if WordIndex.normalize(word) in bonus:
+                    return self.DUPLICATE, word
+                bonus.add(WordIndex.normalize(word))
+                return self.BONUS, word
+            return self.NOT_IN_LIST, word
+        index = self.level_progress.add(canonical)
+        if index is None:
+            return self.DUPLICATE, canonical
+        self.hints.guessed(index)
+        if self.store is not None:
+            self.store.record_word(self.current_level, index, self.words)
+        return self.ACCEPTED, canonical
+
+    @Profiler.timed
+    def feedback(self, text):
+        # Оценка набранного текста для подсказки; вызывается на каждое нажатие клавиши
+        self.sync()
+        if self.cursor is None:
+            if "trie" not in self.level:
+                self.level["trie"] = PrefixTrie(self.words)
+            self.cursor = TrieCursor(self.level["trie"], self.validator)
+        self.cursor.update(text.strip())
+        if not self.cursor.text:
+            return self.EMPTY, None
+        if not self.cursor.is_valid():
+            return self.INVALID_LETTERS, None
+        node = self.cursor.node()
+        word = node.get("") if node is not None else None
+        if word is None:
+            # Не слово уровня - но может быть бонусным словом из словаря, как в evaluate
+            if self.dictionary is not None:
+                text = self.cursor.text
+                if text in self.dictionary:
+                    if text in self.bonus_words.get(self.current_level, ()):
+                        return self.DUPLICATE, text
+                    return self.BONUS, text
+                if node is None and self.dictionary.has_prefix(text):
+                    return self.PREFIX, None
+            return (self.DEAD_END if node is None else self.PREFIX), None
+        if word in self.level_progress:
+            return self.DUPLICATE, word
+        return self.COMPLETE, word
+
+    @Profiler.timed
+    def suggest(self, text):
+        # Похожие ещё не отгаданные слова уровня для отклонённой попытки
+        self.sync()
+        return self.level["suggestions"].lookup(text.strip().lower(), self.level_progress)
+
+    def hint(self):
+        # Следующая буква первого неотгаданного слова; None - отгадано всё
+        self.sync()
+        return self.hints.hint()
+
+    def remaining(self, length=None, letter=None):
+        self.sync()
+        return self.hints.left(length, letter)
+
+    def progress(self):
+        self.sync()
+        return len(self.level_progress), self.required
+
+    def can_advance(self):
+        return self.progress()[0] >= self.required
+
+    def is_last_level(self):
+        return self.current_level == len(self.levels) - 1
+
+    def next_level(self):
+        if not self.can_advance() or self.is_last_level():
+            return False
+        self.record_transition("next")
+        self.load_level(self.current_level + 1)
+        if self.store is not None:
+            self.store.record_level(self.current_level)
+        return True
+
+    def prev_level(self):
+        if self.current_level == 0:
+            return False
+        self.record_transition("prev")
+        self.load_level(self.current_level - 1)
+        if self.store is not None:
+            self.store.record_level(self.current_level)
+        return True
+
+    def save(self):
+        if self.store is not None:
+            # Маски уровней, чьи списки ответов правились, записываются уже в новой нумерации
+            for number, level in self.levels.decoded.items():
+                if level.get("changes") and str(number) in self.guessed_words:
+                    self.progress_of(number)
+            self.save_hints()
+            self.store.save_progress(self.current_level, self.guessed_words)
+
+    def reset(self):
+        if self.store is not None:
+            self.store.reset_progress()
+
+    def level_info(self):
+        found, required = self.progress()
+        return {
+            "number": self.current_level,
+            "name": self.level["name"],
+            "letters": "".join(self.level["letters"]),
+            "found": found,
+            "required": required,
+            "left": self.remaining(),
+            "last": self.is_last_level()
+        }
+
+# ==================== Игровой сервер ====================
+class GameServer:
+    # Много игроков в одном процессе: построчный JSON поверх TCP, одна сессия - один GameEngine
+    # без файлового хранилища. Уровни, векторы букв и словарь общие для всех сессий,
+    # прогресс сессии - битовые маски. Сессии без запросов дольше SESSION_TTL удаляются
+    HOST = "127.0.0.1"
+    PORT = 8765
+    SESSION_TTL = 600
+    MAX_SESSIONS = 100000
+    MAX_LINE = 4096
+
+    def __init__(self, levels=None, dictionary=None):
+        self.levels = levels if levels is not None else LevelSource.default()
+        self.dictionary = dictionary if dictionary is not None else NounDictionary.shared()
+        self.sessions = {}
+        self.last_seen = {}
+
+    def open_session(self, session_id=None):
+        if session_id in self.sessions:
+            return session_id
+        if len(self.sessions) >= self.MAX_SESSIONS:
+            raise ValueError("Слишком много сессий")
+        session_id = os.urandom(8).hex()
+        engine = self.sessions[session_id] = GameEngine(self.levels, store=None, dictionary=self.dictionary,
+                                                        telemetry=Telemetry)
+        engine.restore()
+        return session_id
+
+    def dispatch(self, request, connection):
+        command = request.get("cmd")
+        if command == "hello":
+            session_id = request.get("session")
+            if session_id is not None and not isinstance(session_id, str):
+                raise ValueError("session должен быть строкой")
+            connection["session"] = self.open_session(session_id)
+            engine = self.sessions[connection["session"]]
+            return {"ok": True, "session": connection["session"], "level": engine.level_info()}
+        session_id = connection.get("session")
+        engine = self.sessions.get(session_id)
+        if engine is None:
+            return {"ok": False, "error": "Сначала отправьте hello"}
+        self.last_seen[session_id] = time.monotonic()
+        if command == "submit":
+            result, word = engine.submit(str(request.get("word", "")))
+            found, required = engine.progress()
+            response = {"ok": True, "result": result, "word": word, "found": found, "required": required}
+            if result in (GameEngine.INVALID_LETTERS, GameEngine.NOT_IN_LIST):
+                response["suggestions"] = engine.suggest(word)
+            return response
+        if command == "level":
+            return {"ok": True, "level": engine.level_info()}
+        if command == "hint":
+            return {"ok": True, "hint": engine.hint(), "left": engine.remaining()}
+        if command == "next":
+            return {"ok": engine.next_level(), "level": engine.level_info()}
+        if command == "prev":
+            return {"ok": engine.prev_level(), "level": engine.level_info()}
+        if command == "bye":
+            self.sessions.pop(session_id, None)
+            self.last_seen.pop(session_id, None)
+            connection["session"] = None
+            return {"ok": True}
+        return {"ok": False, "error": f"Неизвестная команда: {command}"}
+
+    async def handle(self, reader, writer):
+        connection = {"session": None}
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    response = self.dispatch(json.loads(line), connection)
+                except (ValueError, AttributeError, TypeError) as error:
+                    response = {"ok": False, "error": str(error)}
+                if connection["session"] is not None:
+                    self.last_seen[connection["session"]] = time.monotonic()
+                writer.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b"\n")
+                # Ждём отправки только когда буфер сокета переполнен
+                if writer.transport.get_write_buffer_size() > 65536:
+                    await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def expire_sessions(self):
+        while True:
+            await asyncio.sleep(self.SESSION_TTL / 4)
+            deadline = time.monotonic() - self.SESSION_TTL
+            for session_id in [sid for sid, seen in self.last_seen.items() if seen < deadline]:
+                self.sessions.pop(session_id, None)
+                self.last_seen.pop(session_id, None)
+
+    async def serve(self, host=HOST, port=PORT):
+        server = await asyncio.start_server(self.handle, host, port, limit=self.MAX_LINE)
+        expiry = asyncio.ensure_future(self.expire_sessions())
+        print(f"Сервер игры слушает {host}:{port}")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            expiry.cancel()
+
+class GameClient:
+    # Клиент сервера игры; run_console заменяет окно игры в терминале
+    def __init__(self):
+        self.reader = None
+        self.writer = None
+
+    async def connect(self, host=GameServer.HOST, port=GameServer.PORT):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+
+    async def request(self, command, **params):
+        params["cmd"] = command
+        self.writer.write(json.dumps(params, ensure_ascii=False).encode('utf-8') + b"\n")
+        return json.loads(await self.reader.readline())
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def run_console(self):
+        loop = asyncio.get_running_loop()
+        response = await self.request("hello")
+        messages = {
+            GameEngine.INVALID_LETTERS: "Используйте только доступные буквы!",
+            GameEngine.NOT_IN_LIST: "Такого слова нет в списке!",
+            GameEngine.DUPLICATE: "Это слово уже отгадано",
+            GameEngine.ACCEPTED: "Слово принято!",
+            GameEngine.BONUS: "Бонусное слово!",
+        }
+        level = response["level"]
+        print("Команды: /next, /prev, /hint, /exit")
+        while True:
+            print(f"{level['name']}: {level['letters'].upper()} ({level['found']} из {level['required']})")
+            try:
+                text = await loop.run_in_executor(None, input, "> ")
+            except EOFError:
+                break
+            if text == "/exit":
+                break
+            if text in ("/next", "/prev"):
+                response = await self.request(text[1:])
+                if not response["ok"]:
+                    print("Переход невозможно выполнить")
+                level = response["level"]
+                continue
+            if text == "/hint":
+                response = await self.request("hint")
+                print(f"Подсказка: {response['hint'].upper()}" if response["hint"] else "Все слова уже отгаданы")
+                continue
+            response = await self.request("submit", word=text)
+            if response["result"] in messages:
+                print(messages[response["result"]])
+            if response.get("suggestions"):
+                print("Может быть: " + ", ".join(response["suggestions"]).upper())
+            level["found"] = response["found"]
+        await self.request("bye")
+        await self.close()
+
+def parse_address(address):
+    host, _, port = address.rpartition(":")
+    return host or GameServer.HOST, int(port or GameServer.PORT)
+
+class LoadTest:
+    # Нагрузочный прогон без окна игры: каждый синтетический игрок - GameEngine со своим профилем
+    # в общей базе ProfileStore (None - без хранилища). Движки создаются и читают прогресс до начала замера.
+    # Попытки приходят по пуассоновскому потоку с частотой rate на игрока (0 - без пауз), задержка
+    # считается от запланированного момента, поэтому отставание от графика тоже попадает в процентили.
+    # Выполненные действия можно записать в JSONL и потом воспроизвести с той же разметкой времени
+    VALID = "valid"
+    DUPLICATE = "duplicate"
+    UNKNOWN = "unknown"
+    INVALID = "invalid"
+    # Доли попыток игрока: отгадка, повтор, несуществующее слово из букв уровня, чужие буквы
+    MIX = ((VALID, 0.55), (DUPLICATE, 0.15), (UNKNOWN, 0.2), (INVALID, 0.1))
+    # Вероятность перейти дальше, когда уровень уже пройден, но отгаданы не все слова
+    ADVANCE_CHANCE = 0.3
+
+    def __init__(self, levels=None, database=ProfileStore.DATABASE_FILE, players=100, rate=2.0, seed=0):
+        self.levels = levels if levels is not None else LevelSource.default()
+        self.database = database
+        self.players = players
+        self.rate = rate
+        self.random = random.Random(seed)
+        self.stores = {}
+        self.engines = {}
+        self.latencies = []
+        self.results = Counter()
+        self.advances = 0
+        self.journal = None
+
+    def engine(self, player):
+        engine = self.engines.get(player)
+        if engine is None:
+            store = None
+            if self.database is not None:
+                shared = next(iter(self.stores.values()), None)
+                store = self.stores[player] = ProfileStore(self.database, f"Игрок {player}", shared)
+            engine = self.engines[player] = GameEngine(self.levels, store=store)
+            engine.restore()
+        return engine
+
+    def prepare(self, players):
+        for player in players:
+            self.engine(player)
+
+    def next_action(self, engine):
+        # Переход по уровням - как кнопка «Следующий уровень» в GameWindow
+        if engine.can_advance():
+            remaining = len(engine.words) - len(engine.level_progress)
+            if remaining == 0 or self.random.random() < self.ADVANCE_CHANCE:
+                return ("restart", "") if engine.is_last_level() else ("next", "")
+        answers = list(engine.words)
+        kind = self.random.choices([kind for kind, _ in self.MIX], [share for _, share in self.MIX])[0]
+        guessed = list(engine.level_progress)
+        missing = [word for word in answers if word not in engine.level_progress]
+        if kind == self.DUPLICATE and guessed:
+            return "submit", self.random.choice(guessed)
+        if kind in (self.VALID, self.DUPLICATE) and missing:
+            return "submit", self.random.choice(missing)
+        # Длина придуманного слова берётся из распределения длин ответов уровня
+        length = len(self.random.choice(answers)) if answers else 3
+        letters = list(WordIndex.normalize("".join(engine.level["letters"])))
+        word = self.random.sample(letters, min(length, len(letters)))
+        if kind == self.INVALID:
+            foreign = [letter for letter in WordValidator.ALPHABET if letter not in letters]
+            word[self.random.randrange(len(word))] = self.random.choice(foreign)
+        return "submit", "".join(word)
+
+    def execute(self, player, command, word, intended):
+        engine = self.engine(player)
+        if command == "submit":
+            self.results[engine.submit(word)[0]] += 1
+        elif command == "next":
+            self.advances += engine.next_level()
+        elif command == "restart":
+            # Как конец игры в GameWindow: прогресс стирается и в хранилище, игра начинается заново
+            engine.reset()
+            engine.restore(0)
+        self.latencies.append(time.perf_counter() - intended)
+
+    def wait_until(self, moment):
+        delay = moment - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+
+    def run(self, duration=10.0, record=None):
+        self.journal = [] if record else None
+        self.prepare(range(self.players))
+        start = time.perf_counter()
+        # Порядковый номер в ключе очереди: при rate=0 игроки ходят по кругу
+        order = self.players
+        schedule = [(self.random.expovariate(self.rate) if self.rate > 0 else 0.0, player, player)
+                    for player in range(self.players)]
+        heapq.heapify(schedule)
+        while schedule:
+            due, _, player = heapq.heappop(schedule)
+            if due > duration or time.perf_counter() - start > duration:
+                continue
+            if self.rate > 0:
+                intended = start + due
+                self.wait_until(intended)
+            else:
+                intended = time.perf_counter()
+            command, word = self.next_action(self.engine(player))
+            self.execute(player, command, word, intended)
+            if self.journal is not None:
+                self.journal.append({"t": round(due, 6), "player": player, "cmd": command, "word": word})
+            order += 1
+            heapq.heappush(schedule, (due + (self.random.expovariate(self.rate) if self.rate > 0 else 0.0), order, player))
+        elapsed = time.perf_counter() - start
+        if record:
+            with open(record, 'w', encoding='utf-8') as f:
+                f.writelines(json.dumps(action, ensure_ascii=False) + "\n" for action in self.journal)
+        return self.report(elapsed)
+
+    def replay(self, path):
+        # Записанный прогон воспроизводится с исходной разметкой времени, при rate=0 - без пауз
+        with open(path, 'r', encoding='utf-8') as f:
+            actions = [json.loads(line) for line in f if line.strip()]
+        self.prepare(sorted({action["player"] for action in actions}))
+        start = time.perf_counter()
+        for action in actions:
+            if self.rate > 0:
+                intended = start + action["t"]
+                self.wait_until(intended)
+            else:
+                intended = time.perf_counter()
+            self.execute(action["player"], action["cmd"], action["word"], intended)
+        return self.report(time.perf_counter() - start)
+
+    def report(self, elapsed):
+        started = time.perf_counter()
+        for store in self.stores.values():
+            store.flush()
+        flush_ms = (time.perf_counter() - started) * 1000
+        latencies = sorted(self.latencies)
+        def percentile(p):
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] * 1e6, 1) if latencies else None
+        return {
+            "players": len(self.engines),
+            "actions": len(latencies),
+            "seconds": round(elapsed, 3),
+            "throughput": round(len(latencies) / elapsed, 1) if elapsed > 0 else None,
+            "latency_us": {"p50": percentile(50), "p95": percentile(95), "p99": percentile(99), "max": percentile(100)},
+            "results": dict(self.results),
+            "advances": self.advances,
+            "final_flush_ms": round(flush_ms, 3)
+        }
+
+# ==================== Запуск без окна ====================
+def warn_bundled(name):
+    # Ресурс из пакета важнее одноимённого файла, поэтому свежесобранный файл без пересборки пакета не виден
+    if Assets.shared().bundled(name):
+        print(f"В {Assets.BUNDLE_FILE} лежит прежняя версия, пересоберите его: --build-bundle")
+
+def add_arguments(parser):
+    # Ключи, которые работают без Qt; окно игры добавляет к ним свои
+    parser.add_argument("--profile", nargs="?", const="stats", choices=["stats", "cprofile"],
+                        help=f"замерять горячие участки и записать {Profiler.REPORT_FILE}; cprofile - ещё и весь цикл событий")
+    parser.add_argument("--build-pack", metavar="ФАЙЛ", help="собрать набор уровней из LEVELS и выйти")
+    parser.add_argument("--build-catalog", metavar="СПИСОК",
+                        help="подобрать уровни по списку существительных, записать набор уровней в папку игры и выйти")
+    parser.add_argument("--catalog-levels", type=int, default=100, metavar="N", help="число уровней для --build-catalog")
+    parser.add_argument("--jobs", type=int, metavar="N", help="число процессов для --build-catalog (по умолчанию все ядра)")
+    parser.add_argument("--build-bundle", action="store_true",
+                        help=f"упаковать ресурсы из {Assets.MANIFEST_FILE} в {Assets.BUNDLE_FILE} и выйти")
+    parser.add_argument("--telemetry-report", nargs="?", const=Telemetry.TELEMETRY_FILE, metavar="ФАЙЛ",
+                        help="вывести сводку по уровням и словам из журнала игры и выйти")
+    parser.add_argument("--load-test", action="store_true",
+                        help="нагрузочный прогон синтетических игроков (сохранения пишутся во временную папку)")
+    parser.add_argument("--players", type=int, default=100, metavar="N", help="число игроков для --load-test")
+    parser.add_argument("--rate", type=float, default=2.0, metavar="R",
+                        help="попыток в секунду на игрока для --load-test, 0 - без пауз")
+    parser.add_argument("--duration", type=float, default=10.0, metavar="СЕК", help="длительность --load-test")
+    parser.add_argument("--record", metavar="ФАЙЛ", help="записать действия игроков --load-test")
+    parser.add_argument("--replay", metavar="ФАЙЛ", help="воспроизвести записанный прогон вместо синтетических игроков")
+    parser.add_argument("--build-dictionary", metavar="СПИСОК", help="собрать словарь существительных из списка слов и выйти")
+    parser.add_argument("--server", nargs="?", const=f"{GameServer.HOST}:{GameServer.PORT}", metavar="ХОСТ:ПОРТ",
+                        help="запустить сервер игры для многих игроков")
+    parser.add_argument("--client", nargs="?", const=f"{GameServer.HOST}:{GameServer.PORT}", metavar="ХОСТ:ПОРТ",
+                        help="играть в терминале через сервер игры")
+
+def run_command(args):
+    # Выполняет команду без окна; False - ни одна не задана и запускается игра
+    if args.profile:
+        Profiler.mode = args.profile
+    if args.server:
+        try:
+            asyncio.run(GameServer().serve(*parse_address(args.server)))
+        except KeyboardInterrupt:
+            pass
+        return True
+    if args.client:
+        async def play(address):
+            client = GameClient()
+            await client.connect(*address)
+            await client.run_console()
+        asyncio.run(play(parse_address(args.client)))
+        return True
+    if args.build_dictionary:
+        with open(args.build_dictionary, 'r', encoding='utf-8') as f:
+            path = Assets.shared().resolve(NounDictionary.DICTIONARY_ASSET)
+            words, edges = NounDictionary.build(f, path)
+        print(f"Словарь записан: {path} ({words} слов, {edges} рёбер)")
+        warn_bundled(NounDictionary.DICTIONARY_ASSET)
+        return True
+    if args.load_test or args.replay:
+        levels = LevelSource.default()
+        record = os.path.abspath(args.record) if args.record else None
+        replay = os.path.abspath(args.replay) if args.replay else None
+        # Хранилище работает как в игре, но не трогает сохранение игрока
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory(prefix="slova-load-") as workdir:
+            os.chdir(workdir)
+            try:
+                test = LoadTest(levels, players=args.players, rate=args.rate)
+                report = test.replay(replay) if replay else test.run(args.duration, record)
+            finally:
+                os.chdir(cwd)
+        print(json.dumps(report, ensure_ascii=False, indent=4))
+        return True
+    if args.telemetry_report:
+        report = Telemetry.aggregate(args.telemetry_report, LevelSource.default())
+        print(json.dumps(report, ensure_ascii=False, indent=4))
+        return True
+    if args.build_bundle:
+        count = Assets(Assets.ROOT).write_bundle(os.path.join(Assets.ROOT, Assets.BUNDLE_FILE))
+        print(f"Пакет ресурсов записан: {Assets.BUNDLE_FILE} ({count} файлов)")
+        return True
+    if args.build_catalog:
+        with open(args.build_catalog, 'r', encoding='utf-8') as f:
+            catalog = CatalogBuilder.build(f, args.catalog_levels, args.jobs)
+        path = Assets.shared().resolve(LevelSource.PACK_ASSET)
+        LevelPack.write(path, catalog)
+        print(f"Набор уровней записан: {path} ({len(catalog)} уровней)")
+        warn_bundled(LevelSource.PACK_ASSET)
+        return True
+    if args.build_pack:
+        LevelPack.write(args.build_pack, LevelList(LEVELS))
+        print(f"Набор уровней записан: {args.build_pack}")
+        return True
+    return False
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Слова из слова без окна: сервер, сборка ресурсов, нагрузочный прогон")
+    add_arguments(parser)
+    if not run_command(parser.parse_args()):
+        parser.print_help()
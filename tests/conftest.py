@@ -0,0 +1,30 @@
+import importlib
+import os
+import sys
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture(scope="session")
+def game():
+    return importlib.import_module("slova_engine")
+
+@pytest.fixture
+def save_dir(game, tmp_path, monkeypatch):
+    # Сохранения, база профилей и журнал игры - во временной папке теста
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(game.Telemetry, "TELEMETRY_FILE", str(tmp_path / game.Telemetry.TELEMETRY_FILE))
+    game.GameSave.reset_progress()
+    yield tmp_path
+    game.GameSave.reset_progress()
+
+@pytest.fixture
+def answers_file(game, tmp_path):
+    # Уровень 1 с файлом ответов во временной папке; write(words) переписывает файл
+    path = tmp_path / "ответы.txt"
+    words = list(game.LevelList(game.LEVELS)[0]["words"].words)
+    def write(words):
+        path.write_text("\n".join(words), encoding='utf-8')
+    write(words)
+    return path, words, write
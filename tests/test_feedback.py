@@ -0,0 +1,24 @@
+import pytest
+
+
+@pytest.fixture
+def engine(game, tmp_path):
+    levels = game.LevelList(game.LEVELS)
+    path = str(tmp_path / "существительные.dawg")
+    game.NounDictionary.build(list(levels[0]["words"]) + ["азик", "кинза"], path)
+    engine = game.GameEngine(levels, store=None, dictionary=game.NounDictionary(path))
+    engine.restore()
+    return engine
+
+def test_bonus_word_feedback_matches_submit(game, engine):
+    assert [engine.feedback(text)[0] for text in ["а", "аз", "ази"]] == [game.GameEngine.PREFIX] * 3
+    assert engine.feedback("азик") == (game.GameEngine.BONUS, "азик")
+    assert engine.submit("азик") == (game.GameEngine.BONUS, "азик")
+    assert engine.feedback("азик") == (game.GameEngine.DUPLICATE, "азик")
+
+def test_dictionary_prefix_is_not_a_dead_end(game, engine):
+    # «кинза» - только в словаре, «кино» - слово уровня
+    assert engine.feedback("кино")[0] == game.GameEngine.COMPLETE
+    assert engine.feedback("кинз")[0] == game.GameEngine.PREFIX
+    assert engine.feedback("кинза")[0] == game.GameEngine.BONUS
+    assert engine.feedback("кинзо")[0] == game.GameEngine.DEAD_END
@@ -0,0 +1,52 @@
+import json
+
+
+def test_restored_counters_match_rebuilt_index(game):
+    levels = game.LevelList(game.LEVELS)
+    engine = game.GameEngine(levels, store=None, dictionary=None)
+    engine.restore()
+    for word in ["кино", "роза", "икона", "рак"]:
+        engine.submit(word)
+    engine.hint()
+    engine.hint()
+    data = json.loads(json.dumps(engine.hints.dump()))
+    assert "bits" not in data
+    restored = game.LevelHints.restore(engine.words, engine.level_progress, data)
+    rebuilt = game.LevelHints(engine.words, engine.level_progress)
+    keys = set(rebuilt.keys)
+    for length, letter in keys:
+        for query in [(length, letter), (length, None), (None, letter)]:
+            assert restored.left(*query) == rebuilt.left(*query)
+    assert restored.left() == rebuilt.left()
+    assert restored.breakdown() == rebuilt.breakdown()
+    assert (restored.target, restored.revealed) == (engine.hints.target, engine.hints.revealed)
+    # Дальше индекс живёт как обычный
+    index = engine.level_progress.add("корзина")
+    restored.guessed(index)
+    rebuilt.guessed(index)
+    assert restored.breakdown() == rebuilt.breakdown()
+
+def test_stale_record_is_rejected(game):
+    levels = game.LevelList(game.LEVELS)
+    words = levels[0]["words"]
+    progress = game.LevelProgress.restore(words, ["кино"])
+    data = game.LevelHints(words, progress).dump()
+    progress.add("роза")
+    assert game.LevelHints.restore(words, progress, data) is None
+    other = game.LevelProgress.restore(levels[1]["words"], ["пар"])
+    assert game.LevelHints.restore(levels[1]["words"], other, data) is None
+
+def test_hints_survive_resume(game, save_dir):
+    levels = game.LevelList(game.LEVELS)
+    engine = game.GameEngine(levels, dictionary=None)
+    engine.restore()
+    for word in ["кино", "роза"]:
+        engine.submit(word)
+    first = engine.hint()
+    engine.save()
+    assert game.GameSave.load_hints(0)["found"] == 2
+    engine = game.GameEngine(levels, dictionary=None)
+    engine.restore()
+    assert engine.remaining() == len(engine.words) - 2
+    # Подсказка продолжает открывать буквы того же слова
+    assert engine.hint().count("•") == first.count("•") - 1
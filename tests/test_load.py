@@ -0,0 +1,22 @@
+import time
+
+
+def test_restart_clears_saved_progress(game, save_dir):
+    levels = game.LevelList(game.LEVELS)
+    test = game.LoadTest(levels, database=str(save_dir / "load.db"), players=1)
+    engine = test.engine(0)
+    for number in range(len(levels)):
+        for word in list(engine.words)[:engine.required]:
+            test.execute(0, "submit", word, time.perf_counter())
+        if number < len(levels) - 1:
+            test.execute(0, "next", "", time.perf_counter())
+    test.execute(0, "restart", "", time.perf_counter())
+    assert engine.current_level == 0 and len(engine.level_progress) == 0
+    test.execute(0, "submit", "икра", time.perf_counter())
+    test.report(0.0)
+    store = game.ProfileStore(str(save_dir / "load.db"), "Игрок 0")
+    current_level, saved = store.load_progress()
+    words = levels[0]["words"]
+    assert current_level == 0
+    assert saved["0"][0] == 1 << words.position("икра")
+    assert set(saved) == {"0"}
@@ -0,0 +1,80 @@
+def level_source(game, path):
+    return game.LevelList([dict(game.LEVELS[0], file=str(path)), game.LEVELS[1]])
+
+def play(engine, level, words):
+    engine.load_level(level)
+    for word in words:
+        assert engine.submit(word)[0] == "accepted"
+
+def saved_words(game, levels, database, profile):
+    # Прогресс профиля, прочитанный заново: свежие уровни и хранилище
+    store = game.ProfileStore(database, profile)
+    engine = game.GameEngine(levels, store=store, dictionary=None)
+    engine.restore()
+    result = {}
+    for number in range(len(levels)):
+        bits, fingerprint, _ = store.load_progress()[1][str(number)]
+        # Маски в хранилище уже в нумерации текущего списка ответов
+        assert fingerprint == levels[number]["words"].fingerprint()
+        result[number] = sorted(game.LevelProgress(levels[number]["words"], bits))
+        assert result[number] == sorted(engine.progress_of(number))
+    return result
+
+def test_reload_remaps_every_profile(game, save_dir, answers_file):
+    path, words, write = answers_file
+    database = str(save_dir / "profiles.db")
+    levels = level_source(game, path)
+    store = game.ProfileStore(database, "Второй")
+    other = game.GameEngine(levels, store=store, dictionary=None)
+    other.restore()
+    play(other, 0, ["кино", "роза", "икра"])
+    play(other, 1, ["пар"])
+    other.save()
+    # Активный профиль ушёл с уровня 0 на уровень 1: уровень 0 декодирован, но не текущий
+    store.select_profile("Первый")
+    engine = game.GameEngine(levels, store=store, dictionary=None)
+    engine.restore()
+    play(engine, 0, ["кино", "рок", "нора"])
+    play(engine, 1, ["воз"])
+    # Другой порядок, новое слово, два слова удалены
+    write(["кинза"] + [word for word in reversed(words) if word not in ("роза", "нора")])
+    assert levels.reload(0)
+    level = levels[0]
+    store.remap_level(0, level["changes"][-1], level["fingerprints"][-1], level["words"])
+    play(engine, 1, ["ров"])
+    # Выход в меню и снова в игру: прогресс читается из кеша хранилища
+    engine.save()
+    engine.restore()
+    play(engine, 0, ["кинза"])
+    engine.save()
+    store.flush()
+    fresh = level_source(game, path)
+    assert saved_words(game, fresh, database, "Первый") == {0: ["кинза", "кино", "рок"], 1: ["воз", "ров"]}
+    assert saved_words(game, fresh, database, "Второй") == {0: ["икра", "кино"], 1: ["пар"]}
+
+def test_reload_remaps_mask_loaded_without_answer_list(game, save_dir, answers_file):
+    # База до отпечатков: маска уровня без списка ответов, игрок стоит на другом уровне
+    path, words, write = answers_file
+    database = str(save_dir / "profiles.db")
+    levels = level_source(game, path)
+    store = game.ProfileStore(database, "Старый")
+    engine = game.GameEngine(levels, store=store, dictionary=None)
+    engine.restore()
+    play(engine, 0, ["кино", "рок"])
+    engine.load_level(1)
+    engine.save()
+    store.connection.execute("UPDATE progress SET fingerprint = 0")
+    store.connection.execute("DELETE FROM answers")
+    store.connection.commit()
+    store = game.ProfileStore(database, "Старый")
+    engine = game.GameEngine(levels, store=store, dictionary=None)
+    assert engine.restore() is levels[1]
+    write(["кинза"] + [word for word in reversed(words) if word != "нора"])
+    assert levels.reload(0)
+    level = levels[0]
+    store.remap_level(0, level["changes"][-1], level["fingerprints"][-1], level["words"])
+    engine.load_level(0)
+    assert sorted(engine.level_progress) == ["кино", "рок"]
+    engine.save()
+    store.flush()
+    assert saved_words(game, level_source(game, path), database, "Старый")[0] == ["кино", "рок"]
@@ -0,0 +1,77 @@
+import os
+
+
+def level_source(game, path):
+    return game.LevelList([dict(game.LEVELS[0], file=str(path)), game.LEVELS[1]])
+
+def found(engine):
+    return sorted(engine.level_progress)
+
+def test_v1_save_loads_and_is_rewritten_as_v2(game, save_dir):
+    levels = game.LevelList(game.LEVELS)
+    words = levels[0]["words"]
+    bits = 1 << words.position("кино") | 1 << words.position("роза")
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    with open(game.GameSave.SAVE_FILE, 'wb') as f:
+        f.write(game.GameSave.HEADER.pack(game.GameSave.MAGIC, 1, 1, 1) + game.GameSave.RECORD_V1.pack(0, len(data)) + data)
+    engine = game.GameEngine(levels, dictionary=None)
+    assert engine.restore() is levels[1]
+    engine.load_level(0)
+    assert found(engine) == ["кино", "роза"]
+    engine.submit("икра")
+    engine.save()
+    with open(game.GameSave.SAVE_FILE, 'rb') as f:
+        assert game.GameSave.HEADER.unpack_from(f.read())[1] == game.GameSave.VERSION
+    engine = game.GameEngine(levels, dictionary=None)
+    engine.restore()
+    engine.load_level(0)
+    assert found(engine) == ["икра", "кино", "роза"]
+
+def test_text_save_is_migrated_to_binary(game, save_dir):
+    with open(game.GameSave.LEGACY_SAVE_FILE, 'w', encoding='utf-8') as f:
+        f.write("current_level:1\nguessed_words:\n0:кино,роза\n1:пар\n")
+    levels = game.LevelList(game.LEVELS)
+    engine = game.GameEngine(levels, dictionary=None)
+    engine.restore()
+    assert engine.current_level == 1
+    assert not os.path.exists(game.GameSave.LEGACY_SAVE_FILE)
+    assert os.path.exists(game.GameSave.SAVE_FILE)
+    engine = game.GameEngine(levels, dictionary=None)
+    engine.restore()
+    engine.load_level(0)
+    assert found(engine) == ["кино", "роза"]
+    assert "пар" in engine.progress_of(1)
+
+def test_torn_journal_line_is_skipped(game, save_dir):
+    levels = game.LevelList(game.LEVELS)
+    engine = game.GameEngine(levels, dictionary=None)
+    engine.restore()
+    for word in ["кино", "роза"]:
+        engine.submit(word)
+    game.GameSave.flush()
+    # Сбой посреди записи последней строки: перевода строки нет
+    with open(game.GameSave.JOURNAL_FILE, 'rb+') as f:
+        f.truncate(os.path.getsize(game.GameSave.JOURNAL_FILE) - 1)
+    engine = game.GameEngine(levels, dictionary=None)
+    engine.restore()
+    assert found(engine) == ["кино"]
+
+def test_progress_follows_words_after_answer_list_is_reordered(game, save_dir, answers_file):
+    path, words, write = answers_file
+    engine = game.GameEngine(level_source(game, path), dictionary=None)
+    engine.restore()
+    engine.submit("кино")
+    engine.save()
+    engine.submit("роза")
+    game.GameSave.flush()
+    # Файл правят между запусками: другой порядок, новое слово и без одного из старых
+    write(["кинза"] + [word for word in reversed(words) if word != "икра"])
+    engine = game.GameEngine(level_source(game, path), dictionary=None)
+    engine.restore()
+    assert found(engine) == ["кино", "роза"]
+    # Новые слова ложатся уже на новую нумерацию
+    engine.submit("кинза")
+    engine.save()
+    engine = game.GameEngine(level_source(game, path), dictionary=None)
+    engine.restore()
+    assert found(engine) == ["кинза", "кино", "роза"]
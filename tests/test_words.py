@@ -0,0 +1,10 @@
+def test_check_many_agrees_with_fits_on_normalized_words(game):
+    validator = game.WordValidator("полёт")
+    words = ["лёт", "ЛЕТ", " лот\t", "тополь", "л ёт"]
+    expected = [validator.fits(game.WordIndex.normalize(word)) for word in words]
+    assert validator.check_many(words) == expected == [True, True, True, False, False]
+
+def test_empty_words_are_rejected(game):
+    validator = game.WordValidator(["к", "о", "т"])
+    assert validator.check_many(["", "  ", "кот"]) == [False, False, True]
+    assert validator.filter_valid(["", "\t", "ток"]) == ["ток"]
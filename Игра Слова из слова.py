@@ -1,64 +1,172 @@
+import time
+STARTUP_TIME = time.perf_counter()
+import argparse
+import atexit
 import os
-from PyQt5 import QtCore, QtGui, QtWidgets, QtMultimedia
+import sys
+import threading
+from collections import OrderedDict
+from PyQt5 import QtCore, QtGui, QtWidgets
+from slova_engine import (Assets, GameEngine, GameSave, LevelList, LevelProgress, LevelSource, ProfileStore,
+                          Profiler, Telemetry, add_arguments, run_command)
+# QtMultimedia тянет за собой мультимедиа-бэкенд, поэтому импортируется только после первой отрисовки
+QtMultimedia = None
+
+def load_multimedia():
+    global QtMultimedia
+    if QtMultimedia is None:
+        try:
+            from PyQt5 import QtMultimedia as module
+        except ImportError:
+            return None
+        QtMultimedia = module
+    return QtMultimedia
+
+class StartupTimer:
+    # Отчёт о времени запуска: SLOVA_STARTUP_TIMER=1 или ключ --startup-timer
+    enabled = os.environ.get("SLOVA_STARTUP_TIMER") == "1" or "--startup-timer" in sys.argv
+    marks = {}
 
-class GameSave:
-    SAVE_FILE = "game_save.txt"
-    @classmethod
-    def save_progress(cls, level, guessed_words):
-        with open(cls.SAVE_FILE, 'w', encoding='utf-8') as f:
-            f.write(f"current_level:{level}\nguessed_words:\n")
-            for lvl, words in guessed_words.items():
-                f.write(f"{lvl}:{','.join(words)}\n")
-    @classmethod
-    def load_progress(cls):
-        if not os.path.exists(cls.SAVE_FILE):
-            return 0, {}
-        with open(cls.SAVE_FILE, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-        current_level = 0
-        guessed_words = {}
-        reading_words = False
-        for line in lines:
-            line = line.strip()
-            if line.startswith("current_level:"):
-                current_level = int(line.split(":")[1])
-            elif line == "guessed_words:":
-                reading_words = True
-            elif reading_words and ":" in line:
-                lvl, words = line.split(":")
-                guessed_words[lvl] = words.split(",") if words else []  
-        return current_level, guessed_words
     @classmethod
-    def reset_progress(cls):
-        if os.path.exists(cls.SAVE_FILE):
-            os.remove(cls.SAVE_FILE)
+    def mark(cls, name):
+        elapsed = (time.perf_counter() - STARTUP_TIME) * 1000
+        cls.marks.setdefault(name, elapsed)
+        if cls.enabled:
+            print(f"[запуск] {name}: {elapsed:.1f} мс")
+        return elapsed
+class SoundEffect(QtCore.QObject):
+    # Звук декодируется в PCM один раз (QAudioDecoder) и проигрывается из памяти несколькими
+    # голосами QAudioOutput: клик не разбирает MP3 заново, а быстрые клики не обрывают друг друга
+    def __init__(self, name, voices, on_started):
+        super().__init__()
+        self.on_started = on_started
+        self.voice_count = voices
+        self.pcm = QtCore.QByteArray()
+        self.format = None
+        self.buffers = []
+        self.voices = []
+        self.started_at = {}
+        self.next_voice = 0
+        # Клик до окончания декодирования проигрывается сразу после него
+        self.pending = False
+        self.source = QtCore.QBuffer(self)
+        self.source.setData(Assets.shared().read(name))
+        self.source.open(QtCore.QIODevice.ReadOnly)
+        self.decoder = QtMultimedia.QAudioDecoder(self)
+        self.decoder.setSourceDevice(self.source)
+        self.decoder.bufferReady.connect(self.on_buffer_ready)
+        self.decoder.finished.connect(self.on_decoded)
+        self.decoder.error.connect(self.on_decode_error)
+        self.decoder.start()
+
+    def on_buffer_ready(self):
+        buffer = self.decoder.read()
+        if buffer.isValid():
+            self.format = buffer.format()
+            self.pcm.append(buffer.constData().asstring(buffer.byteCount()))
+
+    def on_decoded(self):
+        self.release_decoder()
+        if self.format is None:
+            return
+        for _ in range(self.voice_count):
+            # Буферы разделяют один QByteArray, копии PCM не создаются
+            buffer = QtCore.QBuffer(self)
+            buffer.setData(self.pcm)
+            buffer.open(QtCore.QIODevice.ReadOnly)
+            output = QtMultimedia.QAudioOutput(self.format, self)
+            output.stateChanged.connect(lambda state, output=output: self.on_state_changed(output, state))
+            self.buffers.append(buffer)
+            self.voices.append(output)
+        if self.pending:
+            self.pending = False
+            self.play()
+
+    def on_decode_error(self, *args):
+        # Нераспознанный звук просто не проигрывается
+        self.release_decoder()
+        self.pending = False
+
+    def release_decoder(self):
+        # Сжатые данные больше не нужны
+        if self.decoder is not None:
+            self.decoder.deleteLater()
+            self.source.deleteLater()
+            self.decoder = self.source = None
+
+    def play(self):
+        if not self.voices:
+            self.pending = self.decoder is not None
+            return
+        # Свободный голос, иначе - следующий по кругу
+        for i, output in enumerate(self.voices):
+            if output.state() != QtMultimedia.QAudio.ActiveState:
+                break
+        else:
+            i = self.next_voice
+            output = self.voices[i]
+            self.next_voice = (self.next_voice + 1) % len(self.voices)
+            output.stop()
+        self.started_at[output] = time.perf_counter()
+        self.buffers[i].seek(0)
+        output.start(self.buffers[i])
+
+    def on_state_changed(self, output, state):
+        started = self.started_at.pop(output, None)
+        if started is not None and state == QtMultimedia.QAudio.ActiveState:
+            self.on_started(time.perf_counter() - started)
 
 class AudioManager:
+    VOICES = 4
+
     def __init__(self):
-        self.music_player = QtMultimedia.QMediaPlayer()
-        self.sound_player = QtMultimedia.QMediaPlayer()
+        # Плеер создаётся при первом обращении к звуку, а не при построении меню
+        self.music_player = None
+        self.music_buffer = None
+        self.effects = {}
         self.music_enabled = True
         self.sounds_enabled = True
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.cleanup)
-        self.timer.start(1000)
-    
-    def cleanup(self):
-        if self.sound_player.state() == QtMultimedia.QMediaPlayer.StoppedState:
-            self.sound_player.setPosition(0)
 
-    def play_music(self, path):
-        if self.music_enabled and os.path.exists(path):
-            self.music_player.setMedia(QtMultimedia.QMediaContent(QtCore.QUrl.fromLocalFile(path)))
+    def init_backend(self):
+        if self.music_player is None and load_multimedia() is not None:
+            self.music_player = QtMultimedia.QMediaPlayer()
+        return self.music_player is not None
+
+    def preload(self, name):
+        if name not in self.effects and Assets.shared().exists(name) and self.init_backend():
+            self.effects[name] = SoundEffect(name, self.VOICES, self.record_latency)
+        return self.effects.get(name)
+
+    @staticmethod
+    def record_latency(seconds):
+        # Задержка от вызова play_sound до начала воспроизведения попадает в отчёт профайлера
+        if Profiler.enabled:
+            Profiler.record("AudioManager.sound_latency", int(seconds * 1e9))
+
+    @Profiler.timed
+    def play_music(self, name):
+        assets = Assets.shared()
+        if self.music_enabled and assets.exists(name) and self.init_backend():
+            if assets.bundled(name):
+                # Музыка из пакета ресурсов проигрывается прямо из памяти
+                self.music_buffer = QtCore.QBuffer()
+                self.music_buffer.setData(assets.read(name))
+                self.music_buffer.open(QtCore.QIODevice.ReadOnly)
+                self.music_player.setMedia(QtMultimedia.QMediaContent(), self.music_buffer)
+            else:
+                self.music_player.setMedia(QtMultimedia.QMediaContent(QtCore.QUrl.fromLocalFile(assets.resolve(name))))
             self.music_player.play()
     
-    def play_sound(self, path):
-        if self.sounds_enabled and os.path.exists(path):
-            self.sound_player.setMedia(QtMultimedia.QMediaContent(QtCore.QUrl.fromLocalFile(path)))
-            self.sound_player.play()
+    @Profiler.timed
+    def play_sound(self, name):
+        if self.sounds_enabled:
+            effect = self.effects.get(name) or self.preload(name)
+            if effect:
+                effect.play()
     
     def stop_music(self):
-        self.music_player.stop()
+        if self.music_player is not None:
+            self.music_player.stop()
     
     def toggle_music(self):
         self.music_enabled = not self.music_enabled
@@ -68,49 +176,339 @@ class AudioManager:
         self.sounds_enabled = not self.sounds_enabled
         return self.sounds_enabled
 
-class SettingsManager:
+class Settings:
+    def __init__(self, background_index=0, music_enabled=True, sounds_enabled=True):
+        self.background_index = background_index
+        self.music_enabled = music_enabled
+        self.sounds_enabled = sounds_enabled
+
+    @property
+    def background_path(self):
+        return SettingsManager.BACKGROUNDS[self.background_index]
+
+    def as_tuple(self):
+        return self.background_index, self.music_enabled, self.sounds_enabled
+
+class SettingsManager(QtCore.QObject):
+    # Настройки читаются с диска один раз; изменения рассылаются сигналом changed,
+    # а запись на диск откладывается на SAVE_DELAY мс и объединяет несколько изменений
     SETTINGS_FILE = "game_settings.txt"
-    BACKGROUNDS = [
-        r"C:\Users\1\OneDrive\Рабочий стол\Игра\Музыка, звуки, фон\Фон 1.jpg",
-        r"C:\Users\1\OneDrive\Рабочий стол\Игра\Музыка, звуки, фон\Фон 2.jpg",
-        r"C:\Users\1\OneDrive\Рабочий стол\Игра\Музыка, звуки, фон\Фон 3.jpg",
-        r"C:\Users\1\OneDrive\Рабочий стол\Игра\Музыка, звуки, фон\Фон 4.jpg"
-    ]
+    # Имена ресурсов из assets.json
+    BACKGROUNDS = ["backgrounds/1", "backgrounds/2", "backgrounds/3", "backgrounds/4"]
+    SAVE_DELAY = 500
+    changed = QtCore.pyqtSignal(object)
+    shared_instance = None
+
     @classmethod
-    def load_settings(cls):
-        defaults = {
-            "background_index": 0,
-            "music_enabled": True,
-            "sounds_enabled": True,
-            "background_path": cls.BACKGROUNDS[0]
-        }
+    def shared(cls):
+        if cls.shared_instance is None:
+            cls.shared_instance = cls()
+            atexit.register(cls.shared_instance.flush)
+        return cls.shared_instance
+
+    def __init__(self):
+        super().__init__()
+        self.settings = self.read()
+        self.dirty = False
+        self.save_timer = QtCore.QTimer(self)
+        self.save_timer.setSingleShot(True)
+        self.save_timer.setInterval(self.SAVE_DELAY)
+        self.save_timer.timeout.connect(self.flush)
+
+    @classmethod
+    def read(cls):
+        settings = Settings()
         if not os.path.exists(cls.SETTINGS_FILE):
-            return defaults 
+            return settings
         try:
             with open(cls.SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                for line in f:
-                    key, val = line.strip().split(":")
-                    if key in defaults:
-                        if key == "background_index":
-                            idx = int(val)
-                            if 0 <= idx < len(cls.BACKGROUNDS):
-                                defaults[key] = idx
-                                defaults["background_path"] = cls.BACKGROUNDS[idx]
-                        else:
-                            defaults[key] = eval(val)
-            return defaults
-        except:
-            return defaults
+                lines = f.readlines()
+        except OSError:
+            return settings
+        # Повреждённые строки пропускаются по одной, остальные значения сохраняются
+        for line in lines:
+            key, _, val = line.strip().partition(":")
+            if key == "background_index" and val.isdigit():
+                if int(val) < len(cls.BACKGROUNDS):
+                    settings.background_index = int(val)
+            elif key in ("music_enabled", "sounds_enabled") and val in ("True", "False"):
+                setattr(settings, key, val == "True")
+        return settings
+
+    def update(self, **changes):
+        before = self.settings.as_tuple()
+        for key, val in changes.items():
+            setattr(self.settings, key, val)
+        if self.settings.as_tuple() != before:
+            self.dirty = True
+            self.save_timer.start()
+            self.changed.emit(self.settings)
+
+    def flush(self):
+        if not self.dirty:
+            return
+        self.dirty = False
+        GameSave.write_atomic(self.SETTINGS_FILE, (
+            f"background_index:{self.settings.background_index}\n"
+            f"music_enabled:{self.settings.music_enabled}\n"
+            f"sounds_enabled:{self.settings.sounds_enabled}\n"
+        ).encode('utf-8'))
+
+class ImageLoaderSignals(QtCore.QObject):
+    finished = QtCore.pyqtSignal(object, QtGui.QImage)
+
+class ImageLoader(QtCore.QRunnable):
+    # Чтение и декодирование JPEG в рабочем потоке сразу в нужном размере через QImageReader
+    def __init__(self, key, signals):
+        super().__init__()
+        self.key = key
+        self.signals = signals
+
+    @Profiler.timed
+    def run(self):
+        name, width, height, mode = self.key
+        buffer = QtCore.QBuffer()
+        buffer.setData(Assets.shared().read(name) or b"")
+        reader = QtGui.QImageReader(buffer)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid():
+            reader.setScaledSize(size.scaled(width, height, mode))
+        self.signals.finished.emit(self.key, reader.read())
+
+class ImageCache(QtCore.QObject):
+    # Общий LRU-кеш готовых QPixmap по ключу (путь, ширина, высота, режим масштабирования)
+    MAX_BYTES = 64 * 1024 * 1024
+    shared_instance = None
+
     @classmethod
-    def save_settings(cls, bg_index, music, sounds):
-        with open(cls.SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            f.write(f"background_index:{bg_index}\n")
-            f.write(f"music_enabled:{music}\n")
-            f.write(f"sounds_enabled:{sounds}\n")
+    def shared(cls):
+        if cls.shared_instance is None:
+            cls.shared_instance = cls()
+        return cls.shared_instance
+
+    def __init__(self):
+        super().__init__()
+        self.pixmaps = OrderedDict()
+        self.total_bytes = 0
+        self.waiting = {}
+        self.signals = ImageLoaderSignals()
+        self.signals.finished.connect(self.on_loaded)
+        self.pool = QtCore.QThreadPool.globalInstance()
+
+    def get(self, path, size, callback=None, mode=QtCore.Qt.KeepAspectRatioByExpanding):
+        key = (path, size.width(), size.height(), mode)
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            if callback:
+                callback(path, pixmap)
+            return
+        callbacks = self.waiting.get(key)
+        if callbacks is None:
+            callbacks = self.waiting[key] = []
+            self.pool.start(ImageLoader(key, self.signals))
+        if callback:
+            callbacks.append(callback)
+
+    def prefetch(self, path, size, mode=QtCore.Qt.KeepAspectRatioByExpanding):
+        if Assets.shared().exists(path):
+            self.get(path, size, None, mode)
+
+    @Profiler.timed
+    def on_loaded(self, key, image):
+        # QPixmap создаётся только в GUI-потоке
+        pixmap = QtGui.QPixmap.fromImage(image)
+        if not pixmap.isNull():
+            self.pixmaps[key] = pixmap
+            self.total_bytes += self.pixmap_bytes(pixmap)
+            while self.total_bytes > self.MAX_BYTES and len(self.pixmaps) > 1:
+                _, old = self.pixmaps.popitem(last=False)
+                self.total_bytes -= self.pixmap_bytes(old)
+        for callback in self.waiting.pop(key, []):
+            callback(key[0], pixmap)
+
+    @staticmethod
+    def pixmap_bytes(pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def fill_background(self, widget, path):
+        if not Assets.shared().exists(path):
+            return
+        # Если фон успели сменить, пока картинка декодировалась, устаревший результат игнорируется
+        widget.setProperty("background_path", path)
+        def apply(loaded_path, pixmap):
+            if pixmap.isNull() or widget.property("background_path") != loaded_path:
+                return
+            widget.setAutoFillBackground(True)
+            palette = widget.palette()
+            palette.setBrush(QtGui.QPalette.Window, QtGui.QBrush(pixmap))
+            widget.setPalette(palette)
+        self.get(path, widget.window().size(), apply)
+
+class WordListWatcher(QtCore.QObject):
+    # Режим правки уровней (--watch): при сохранении файла ответов перечитывается только он.
+    # Редакторы часто сохраняют заменой файла и шлют несколько сигналов подряд, поэтому
+    # перечитывание откладывается на RELOAD_DELAY мс, а пропавший из наблюдения путь добавляется снова
+    RELOAD_DELAY = 200
+    changed = QtCore.pyqtSignal(int)
+
+    def __init__(self, levels):
+        super().__init__()
+        self.levels = levels
+        self.paths = {}
+        assets = Assets.shared()
+        for i, definition in enumerate(levels.definitions):
+            if not assets.bundled(definition["file"]) and assets.exists(definition["file"]):
+                self.paths[assets.resolve(definition["file"])] = i
+        self.pending = set()
+        self.watcher = QtCore.QFileSystemWatcher(list(self.paths), self)
+        self.watcher.fileChanged.connect(self.on_file_changed)
+        self.timer = QtCore.QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.RELOAD_DELAY)
+        self.timer.timeout.connect(self.reload)
+
+    def on_file_changed(self, path):
+        self.pending.add(self.paths[path])
+        self.timer.start()
+
+    def reload(self):
+        missing = [path for path in self.paths if path not in self.watcher.files() and os.path.exists(path)]
+        if missing:
+            self.watcher.addPaths(missing)
+        for i in sorted(self.pending):
+            if self.levels.reload(i):
+                self.changed.emit(i)
+        self.pending.clear()
+
+class Theme:
+    # Общая таблица стилей приложения: Qt разбирает её один раз при установке, а виджеты выбираются
+    # по классу окна, objectName и динамическому свойству tone
+    STYLESHEET = """
+        QPushButton {
+            background: rgba(230,230,230,0.8);
+            border-radius: 5px;
+            border: 1px solid #aaa;
+            padding: 5px;
+        }
+        QPushButton:hover {
+            background: rgba(210,230,250,0.9);
+        }
+        QPushButton#menuButton {
+            border-radius: 10px;
+            font-size: 24px;
+        }
+        QPushButton#rulesButton {
+            font-size: 14px;
+        }
+        QLabel#title {
+            font-size: 36px;
+            font-family: 'Times New Roman';
+            background: rgba(240,240,240,0.8);
+            border-radius: 10px;
+            padding: 10px;
+            color: #333;
+        }
+        QLabel#rulesTitle {
+            font-size: 18px;
+            font-family: 'Times New Roman';
+        }
+        StartDialog QPushButton {
+            padding: 10px;
+        }
+        SettingsDialog QPushButton {
+            font-size: 18px;
+            padding: 0px;
+        }
+        QLabel#dialogTitle {
+            font-size: 24px;
+            font-family: 'Times New Roman';
+            padding: 10px;
+        }
+        QLabel#preview {
+            background: #f5f5f5;
+            border: 2px solid #ccc;
+            border-radius: 5px;
+        }
+        SettingsDialog QGroupBox {
+            background: rgba(240,240,240,0.7);
+            border-radius: 5px;
+            padding: 10px;
+            border: 1px solid #ccc;
+            font-size: 18px;
+        }
+        GameWindow QPushButton {
+            font-size: 14px;
+        }
+        QFrame#panel, QLabel#levelLabel {
+            background: rgba(245,245,245,0.85);
+            border-radius: 5px;
+            border: 1px solid #bbb;
+        }
+        QLabel#levelLabel, QLabel#sourceWord {
+            font-size: 24px;
+            font-weight: bold;
+        }
+        QLabel#caption {
+            font-size: 18px;
+        }
+        QLineEdit#wordInput {
+            font-size: 24px;
+            font-weight: bold;
+            border: none;
+            background: transparent;
+        }
+        QLabel#wordsCounter, QListView#wordsList {
+            font-size: 18px;
+            font-weight: bold;
+            border: none;
+        }
+        QLabel#feedback {
+            font-size: 12px;
+            border: none;
+            background: transparent;
+            color: #333;
+        }
+        QLabel#feedback[tone="error"] {
+            color: #c0392b;
+        }
+        QLabel#feedback[tone="success"] {
+            color: #27ae60;
+        }
+        QLabel#feedback[tone="warning"] {
+            color: #e67e22;
+        }
+        QLabel#feedback[tone="info"] {
+            color: #2980b9;
+        }
+    """
+    applied = False
+
+    @classmethod
+    def apply(cls, app=None):
+        app = app or QtWidgets.QApplication.instance()
+        if not cls.applied and app is not None:
+            app.setStyleSheet(cls.STYLESHEET)
+            cls.applied = True
+
+    @staticmethod
+    def set_tone(widget, tone):
+        # Смена свойства перекрашивает только этот виджет, таблица стилей заново не разбирается
+        if widget.property("tone") != tone:
+            widget.setProperty("tone", tone)
+            widget.style().unpolish(widget)
+            widget.style().polish(widget)
+
 # ==================== Игровые окна ====================
 class MainMenu(QtWidgets.QMainWindow):
     def __init__(self):
         super().__init__()
+        self.first_paint_done = False
+        self.store = None
+        self.game_window = None
+        self.watcher = None
+        Theme.apply()
         self.setup_ui()
         self.setup_audio()
         self.connect_buttons()
@@ -119,50 +517,69 @@ class MainMenu(QtWidgets.QMainWindow):
         self.setWindowTitle("Игра Слова из слова")
         self.setFixedSize(800, 600)
         self.central = QtWidgets.QWidget()
+        self.central.installEventFilter(self)
         self.setCentralWidget(self.central)
-        self.settings = SettingsManager.load_settings()
-        self.set_background(self.settings["background_path"])
+        self.settings = SettingsManager.shared().settings
+        SettingsManager.shared().changed.connect(self.apply_settings)
+        self.set_background(self.settings.background_path)
         self.title = QtWidgets.QLabel("Слова из слова", self.central)
         self.title.setGeometry(200, 80, 400, 80)
         self.title.setAlignment(QtCore.Qt.AlignCenter)
-        self.title.setStyleSheet("""
-            font-size: 36px; 
-            font-family: 'Times New Roman';
-            background: rgba(240,240,240,0.8); 
-            border-radius: 10px;
-            padding: 10px;
-            color: #333;
-        """)
+        self.title.setObjectName("title")
         self.start_btn = self.create_button("Начать игру", 250, 200)
         self.settings_btn = self.create_button("Настройки", 250, 300)
         self.exit_btn = self.create_button("Выход", 250, 400)
-        self.rules_btn = self.create_button("Правила игры", 600, 20, 150, 40, 14)
+        self.rules_btn = self.create_button("Правила игры", 600, 20, 150, 40, "rulesButton")
     
-    def create_button(self, text, x, y, w=300, h=80, font_size=24):
+    def create_button(self, text, x, y, w=300, h=80, name="menuButton"):
         btn = QtWidgets.QPushButton(text, self.central)
         btn.setGeometry(x, y, w, h)
-        btn.setStyleSheet(f"""
-            QPushButton {{
-                background: rgba(230,230,230,0.8);
-                border-radius: {10 if h==80 else 5}px;
-                font-size: {font_size}px;
-                border: 1px solid #aaa;
-                padding: 5px;
-            }}
-            QPushButton:hover {{
-                background: rgba(210,230,250,0.9);
-            }}
-        """)
+        btn.setObjectName(name)
         return btn
     
     def setup_audio(self):
         self.audio = AudioManager()
-        self.audio.music_enabled = self.settings["music_enabled"]
-        self.audio.sounds_enabled = self.settings["sounds_enabled"]
-        self.music_path = r"C:\Users\1\OneDrive\Рабочий стол\Игра\Музыка, звуки, фон\Фоновая музыка.mp3"
-        self.click_sound = r"C:\Users\1\OneDrive\Рабочий стол\Игра\Музыка, звуки, фон\звук клика.mp3"
-        if self.settings["music_enabled"]:
+        self.audio.music_enabled = self.settings.music_enabled
+        self.audio.sounds_enabled = self.settings.sounds_enabled
+        self.music_path = "music"
+        self.click_sound = "click"
+    
+    def eventFilter(self, obj, event):
+        # Центральный виджет закрывает окно целиком, поэтому первый кадр ловим на нём
+        if obj is self.central and event.type() == QtCore.QEvent.Paint and not self.first_paint_done:
+            self.first_paint_done = True
+            StartupTimer.mark("первая отрисовка меню")
+            QtCore.QTimer.singleShot(0, self.deferred_start)
+        return super().eventFilter(obj, event)
+    
+    def deferred_start(self):
+        # Всё, что не нужно для первого кадра: мультимедиа, музыка и проверка файлов
+        self.audio.preload(self.click_sound)
+        if self.settings.music_enabled:
             self.audio.play_music(self.music_path)
+        StartupTimer.mark("звук загружен")
+        threading.Thread(target=check_assets, args=(self.music_path, self.click_sound), daemon=True).start()
+        QtCore.QTimer.singleShot(0, self.prepare_game)
+    
+    def watch_levels(self):
+        levels = LevelSource.default()
+        if isinstance(levels, LevelList):
+            self.watcher = WordListWatcher(levels)
+            # Подключается раньше окна игры: сохранённые маски всех профилей переводятся до того,
+            # как окно сохранит прогресс текущего
+            self.watcher.changed.connect(self.remap_saved_progress)
+        return self.watcher
+    
+    def remap_saved_progress(self, number):
+        if self.store is not None:
+            level = LevelSource.default()[number]
+            self.store.remap_level(number, level["changes"][-1], level["fingerprints"][-1], level["words"])
+    
+    def prepare_game(self):
+        # Окно игры строится один раз, пока меню простаивает, и дальше только сбрасывается
+        if self.game_window is None:
+            self.store = ProfileStore.shared()
+            self.game_window = GameWindow(self)
     
     def connect_buttons(self):
         self.rules_btn.clicked.connect(self.show_rules)
@@ -171,11 +588,7 @@ class MainMenu(QtWidgets.QMainWindow):
         self.exit_btn.clicked.connect(self.close)
     
     def set_background(self, path):
-        if os.path.exists(path):
-            self.central.setAutoFillBackground(True)
-            palette = self.central.palette()
-            palette.setBrush(QtGui.QPalette.Window, QtGui.QBrush(QtGui.QPixmap(path)))
-            self.central.setPalette(palette)
+        ImageCache.shared().fill_background(self.central, path)
      #окно с правилами игры   
     def show_rules(self):
         self.audio.play_sound(self.click_sound)
@@ -185,7 +598,7 @@ class MainMenu(QtWidgets.QMainWindow):
         title = QtWidgets.QLabel("Правила игры", dialog)
         title.setGeometry(200, 20, 200, 50)
         title.setAlignment(QtCore.Qt.AlignCenter)
-        title.setStyleSheet("font-size: 18px; font-family: 'Times New Roman';")
+        title.setObjectName("rulesTitle")
         rules_text = QtWidgets.QTextBrowser(dialog)
         rules_text.setGeometry(20, 80, 560, 350)
         rules_text.setHtml("""
@@ -206,24 +619,29 @@ class MainMenu(QtWidgets.QMainWindow):
     def show_settings(self):
         self.audio.play_sound(self.click_sound)
         dialog = SettingsDialog(self)
-        if dialog.exec_() == QtWidgets.QDialog.Accepted:
-            self.settings = SettingsManager.load_settings()
-            self.set_background(self.settings["background_path"])
-            self.audio.music_enabled = self.settings["music_enabled"]
-            self.audio.sounds_enabled = self.settings["sounds_enabled"]
-            if not self.settings["music_enabled"]:
-                self.audio.stop_music()
+        dialog.exec_()
+    
+    def apply_settings(self, settings):
+        self.set_background(settings.background_path)
+        music_was_enabled = self.audio.music_enabled
+        self.audio.music_enabled = settings.music_enabled
+        self.audio.sounds_enabled = settings.sounds_enabled
+        if not settings.music_enabled:
+            self.audio.stop_music()
+        elif not music_was_enabled:
+            self.audio.play_music(self.music_path)
         
     def start_game(self):
         self.audio.play_sound(self.click_sound)
+        self.prepare_game()
         dialog = StartDialog(self)
         if dialog.exec_() == QtWidgets.QDialog.Accepted:
-            self.game_window = GameWindow(self, dialog.start_level)
-            self.game_window.show()
+            self.game_window.start(dialog.start_level)
             self.hide()
     
     def closeEvent(self, event):
         self.audio.stop_music()
+        SettingsManager.shared().flush()
         event.accept()
 
 class StartDialog(QtWidgets.QDialog):
@@ -234,41 +652,49 @@ class StartDialog(QtWidgets.QDialog):
         
     def setup_ui(self):
         self.setWindowTitle("Начать игру")
-        self.setFixedSize(300, 150)
+        self.setFixedSize(300, 190)
         layout = QtWidgets.QVBoxLayout()
+        self.store = self.parent.store
+        # Выбор профиля; новое имя можно ввести прямо в поле
+        self.profile_box = QtWidgets.QComboBox()
+        self.profile_box.setEditable(True)
+        self.profile_box.addItems(self.store.profiles())
+        self.profile_box.setCurrentText(self.store.profile)
+        layout.addWidget(self.profile_box)
         self.new_game_btn = QtWidgets.QPushButton("Новая игра")
         self.continue_btn = QtWidgets.QPushButton("Продолжить")
         self.cancel_btn = QtWidgets.QPushButton("Отмена")
         for btn in [self.new_game_btn, self.continue_btn, self.cancel_btn]:
-            btn.setStyleSheet("""
-                QPushButton {
-                    background: rgba(230,230,230,0.8);
-                    border-radius: 5px;
-                    padding: 10px;
-                    border: 1px solid #aaa;
-                }
-                QPushButton:hover {
-                    background: rgba(210,230,250,0.9);
-                }
-            """)
             layout.addWidget(btn)
         self.setLayout(layout)
-        # Проверка сохраненной игры
-        saved_level, guessed_words = GameSave.load_progress()
-        has_progress = saved_level > 0 or bool(guessed_words)
-        self.continue_btn.setEnabled(has_progress)
+        self.update_continue()
+        self.profile_box.activated.connect(self.select_profile)
         self.new_game_btn.clicked.connect(self.start_new)
         self.continue_btn.clicked.connect(self.continue_game)
         self.cancel_btn.clicked.connect(self.reject)
         self.start_level = 0
     
+    def select_profile(self):
+        name = self.profile_box.currentText().strip()
+        if name and name != self.store.profile:
+            self.store.select_profile(name)
+        self.update_continue()
+    
+    def update_continue(self):
+        # Проверка сохраненной игры; прочитанный прогресс кешируется и достаётся окну игры
+        saved_level, guessed_words = self.store.load_progress()
+        has_progress = saved_level > 0 or any(LevelProgress.saved(saved)[0] for saved in guessed_words.values())
+        self.continue_btn.setEnabled(has_progress)
+    
     def start_new(self):
+        self.select_profile()
         self.start_level = 0
-        GameSave.reset_progress()
+        self.store.reset_progress()
         self.accept()
     
     def continue_game(self):
-        self.start_level, _ = GameSave.load_progress()
+        self.select_profile()
+        self.start_level, _ = self.store.load_progress()
         self.accept()
 
 class SettingsDialog(QtWidgets.QDialog):
@@ -284,11 +710,7 @@ class SettingsDialog(QtWidgets.QDialog):
         layout = QtWidgets.QVBoxLayout()
         title = QtWidgets.QLabel("Настройки игры")
         title.setAlignment(QtCore.Qt.AlignCenter)
-        title.setStyleSheet("""
-            font-size: 24px;
-            font-family: 'Times New Roman';
-            padding: 10px;
-        """)
+        title.setObjectName("dialogTitle")
         layout.addWidget(title)
         bg_group = QtWidgets.QGroupBox("Смена фона")
         bg_layout = QtWidgets.QVBoxLayout()
@@ -298,11 +720,7 @@ class SettingsDialog(QtWidgets.QDialog):
         self.preview = QtWidgets.QLabel()
         self.preview.setFixedSize(400, 200)
         self.preview.setAlignment(QtCore.Qt.AlignCenter)
-        self.preview.setStyleSheet("""
-            background: #f5f5f5;
-            border: 2px solid #ccc;
-            border-radius: 5px;
-        """)
+        self.preview.setObjectName("preview")
         self.next_btn = QtWidgets.QPushButton(">")
         self.next_btn.setFixedSize(50, 50)
         preview_layout.addWidget(self.prev_btn)
@@ -330,29 +748,6 @@ class SettingsDialog(QtWidgets.QDialog):
         btn_layout.addWidget(self.cancel_btn)
         layout.addLayout(btn_layout)
         self.setLayout(layout)
-        for btn in [self.prev_btn, self.next_btn, self.music_btn, self.sounds_btn, 
-                   self.save_btn, self.cancel_btn]:
-            btn.setStyleSheet("""
-                QPushButton {
-                    background: rgba(230,230,230,0.8);
-                    border-radius: 5px;
-                    border: 1px solid #aaa;
-                    font-size: 18px;
-                }
-                QPushButton:hover {
-                    background: rgba(210,230,250,0.9);
-                }
-            """)
-        for group in [bg_group, sound_group]:
-            group.setStyleSheet("""
-                QGroupBox {
-                    background: rgba(240,240,240,0.7);
-                    border-radius: 5px;
-                    padding: 10px;
-                    border: 1px solid #ccc;
-                    font-size: 18px;
-                }
-            """)
         self.prev_btn.clicked.connect(self.prev_bg)
         self.next_btn.clicked.connect(self.next_bg)
         self.music_btn.clicked.connect(self.toggle_music)
@@ -361,24 +756,32 @@ class SettingsDialog(QtWidgets.QDialog):
         self.cancel_btn.clicked.connect(self.reject)
     
     def load_settings(self):
-        self.settings = SettingsManager.load_settings()
-        self.bg_index = self.settings["background_index"]
-        self.music_enabled = self.settings["music_enabled"]
-        self.sounds_enabled = self.settings["sounds_enabled"]
+        settings = SettingsManager.shared().settings
+        self.bg_index = settings.background_index
+        self.music_enabled = settings.music_enabled
+        self.sounds_enabled = settings.sounds_enabled
         self.update_preview()
         self.update_buttons()
     
     def update_preview(self):
         if 0 <= self.bg_index < len(SettingsManager.BACKGROUNDS):
             path = SettingsManager.BACKGROUNDS[self.bg_index]
-            if os.path.exists(path):
-                pixmap = QtGui.QPixmap(path)
-                pixmap = pixmap.scaled(400, 200, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
-                self.preview.setPixmap(pixmap)
+            if Assets.shared().exists(path):
+                cache = ImageCache.shared()
+                cache.get(path, self.preview.size(), self.show_preview, QtCore.Qt.KeepAspectRatio)
+                # Соседние фоны и полноразмерный вариант текущего готовим заранее
+                count = len(SettingsManager.BACKGROUNDS)
+                for i in (self.bg_index - 1, self.bg_index + 1):
+                    cache.prefetch(SettingsManager.BACKGROUNDS[i % count], self.preview.size(), QtCore.Qt.KeepAspectRatio)
+                cache.prefetch(path, self.parent.size())
                 return
         self.preview.setText("Фон не найден")
         self.preview.setPixmap(QtGui.QPixmap())
     
+    def show_preview(self, path, pixmap):
+        if path == SettingsManager.BACKGROUNDS[self.bg_index] and not pixmap.isNull():
+            self.preview.setPixmap(pixmap)
+    
     def update_buttons(self):
         self.music_btn.setText(f"Музыка: {'ВКЛ' if self.music_enabled else 'ВЫКЛ'}")
         self.sounds_btn.setText(f"Звуки: {'ВКЛ' if self.sounds_enabled else 'ВЫКЛ'}")
@@ -405,34 +808,160 @@ class SettingsDialog(QtWidgets.QDialog):
     
     def save_settings(self):
         self.parent.audio.play_sound(self.parent.click_sound)
-        SettingsManager.save_settings(
-            self.bg_index,
-            self.music_enabled,
-            self.sounds_enabled
+        SettingsManager.shared().update(
+            background_index=self.bg_index,
+            music_enabled=self.music_enabled,
+            sounds_enabled=self.sounds_enabled
         )
         self.accept()
 
+class GuessedWordsModel(QtCore.QAbstractListModel):
+    # Отгаданные слова уровня; новое слово добавляется одной строкой, без перестройки списка.
+    # Порядок отгадывания не сохраняется (прогресс - битовая маска), поэтому OrderRole - номер слова
+    # в списке ответов уровня: он одинаков и после отгадки, и после возвращения на уровень
+    LengthRole = QtCore.Qt.UserRole + 1
+    OrderRole = QtCore.Qt.UserRole + 2
+
+    def __init__(self):
+        super().__init__()
+        self.words = []
+        self.answers = None
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.words)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        word = self.words[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return word.upper()
+        if role == self.LengthRole:
+            return len(word)
+        if role == self.OrderRole:
+            return self.position(index.row())
+        return None
+
+    def position(self, row):
+        if self.answers is None:
+            return row
+        position = self.answers.position(self.words[row])
+        return position if position is not None else row
+
+    def set_words(self, words, answers=None):
+        self.beginResetModel()
+        self.words = list(words)
+        self.answers = answers
+        self.endResetModel()
+
+    def append(self, word):
+        row = len(self.words)
+        self.beginInsertRows(QtCore.QModelIndex(), row, row)
+        self.words.append(word)
+        self.endInsertRows()
+
+class GuessedWordsProxy(QtCore.QSortFilterProxyModel):
+    MODES = ["По списку", "По алфавиту", "По длине"]
+
+    def __init__(self, model):
+        super().__init__()
+        self.mode = 0
+        self.setSourceModel(model)
+        self.setDynamicSortFilter(True)
+        self.sort(0)
+
+    def set_mode(self, mode):
+        self.mode = mode
+        self.invalidate()
+        self.sort(0)
+
+    def lessThan(self, left, right):
+        model = self.sourceModel()
+        if self.mode == 0:
+            return model.position(left.row()) < model.position(right.row())
+        a = model.words[left.row()]
+        b = model.words[right.row()]
+        if self.mode == 1:
+            return a < b
+        # Группировка по длине: сначала длинные слова, внутри группы - по алфавиту
+        return (-len(a), a) < (-len(b), b)
+
+class GroupedWordDelegate(QtWidgets.QStyledItemDelegate):
+    # В режиме группировки над первым словом каждой группы рисуется заголовок «N букв»
+    HEADER_HEIGHT = 24
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self.grouped = False
+
+    def is_group_start(self, index):
+        if not self.grouped:
+            return False
+        if index.row() == 0:
+            return True
+        model = index.model()
+        previous = model.index(index.row() - 1, 0)
+        return model.data(previous, GuessedWordsModel.LengthRole) != model.data(index, GuessedWordsModel.LengthRole)
+
+    def sizeHint(self, option, index):
+        size = super().sizeHint(option, index)
+        if self.is_group_start(index):
+            size.setHeight(size.height() + self.HEADER_HEIGHT)
+        return size
+
+    @staticmethod
+    def header_text(length):
+        if length % 10 == 1 and length % 100 != 11:
+            return f"{length} буква"
+        if 2 <= length % 10 <= 4 and not 12 <= length % 100 <= 14:
+            return f"{length} буквы"
+        return f"{length} букв"
+
+    def paint(self, painter, option, index):
+        if self.is_group_start(index):
+            header = QtCore.QRect(option.rect)
+            header.setHeight(self.HEADER_HEIGHT)
+            painter.save()
+            painter.setPen(QtGui.QColor("#777"))
+            painter.drawText(header, QtCore.Qt.AlignLeft | QtCore.Qt.AlignVCenter,
+                             self.header_text(index.data(GuessedWordsModel.LengthRole)))
+            painter.restore()
+            option = QtWidgets.QStyleOptionViewItem(option)
+            option.rect.setTop(option.rect.top() + self.HEADER_HEIGHT)
+        super().paint(painter, option, index)
+
 class GameWindow(QtWidgets.QMainWindow):
-    def __init__(self, parent, start_level=0):
+    # Окно живёт всё время работы программы: start заново читает прогресс и показывает окно,
+    # возврат в меню окно только прячет; telemetry - журнал для GameEngine, None - не записывать
+    def __init__(self, parent, telemetry=Telemetry):
         super().__init__()
         self.parent = parent
-        self.current_level = start_level
-        self.guessed_words = {}
+        self.engine = GameEngine(store=parent.store, telemetry=telemetry)
         self.setup_ui()
-        self.load_levels()
+        if parent.watcher is not None:
+            parent.watcher.changed.connect(self.on_words_changed)
+    
+    def start(self, start_level=0):
+        self.engine.restore(start_level)
+        self.sort_box.setCurrentIndex(0)
         self.setup_level()
+        self.show()
         
     def setup_ui(self):
         self.setWindowTitle("Игра Слова из слова")
         self.setFixedSize(800, 600)
         self.central = QtWidgets.QWidget()
         self.setCentralWidget(self.central)
-        self.set_background(self.parent.settings["background_path"])
+        self.set_background(self.parent.settings.background_path)
+        SettingsManager.shared().changed.connect(self.apply_settings)
         self.menu_btn = QtWidgets.QPushButton("Выход в меню", self.central)
         self.menu_btn.setGeometry(20, 20, 150, 40)
         self.level_label = QtWidgets.QLabel(self.central)
         self.level_label.setGeometry(300, 20, 200, 40)
         self.level_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.level_label.setObjectName("levelLabel")
+        self.hint_btn = QtWidgets.QPushButton("Подсказка", self.central)
+        self.hint_btn.setGeometry(630, 20, 150, 40)
         self.source_frame = QtWidgets.QFrame(self.central)
         self.source_frame.setGeometry(50, 80, 700, 60)
         self.source_label = QtWidgets.QLabel("Исходное слово:", self.source_frame)
@@ -440,6 +969,7 @@ class GameWindow(QtWidgets.QMainWindow):
         self.source_word = QtWidgets.QLabel(self.source_frame)
         self.source_word.setGeometry(180, 10, 500, 40)
         self.source_word.setAlignment(QtCore.Qt.AlignCenter)
+        self.source_word.setObjectName("sourceWord")
         self.word_frame = QtWidgets.QFrame(self.central)
         self.word_frame.setGeometry(50, 160, 700, 80)
         self.word_label = QtWidgets.QLabel("Введённое слово:", self.word_frame)
@@ -447,164 +977,174 @@ class GameWindow(QtWidgets.QMainWindow):
         self.word_input = QtWidgets.QLineEdit(self.word_frame)
         self.word_input.setGeometry(180, 20, 400, 40)
         self.word_input.setAlignment(QtCore.Qt.AlignCenter)
+        self.word_input.setObjectName("wordInput")
         self.check_btn = QtWidgets.QPushButton("Проверить", self.word_frame)
         self.check_btn.setGeometry(590, 20, 80, 40)
+        self.feedback_label = QtWidgets.QLabel(self.word_frame)
+        self.feedback_label.setGeometry(60, 60, 640, 18)
+        self.feedback_label.setAlignment(QtCore.Qt.AlignCenter)
+        self.feedback_label.setObjectName("feedback")
         #список слов
-        self.words_list = QtWidgets.QTextBrowser(self.central)
-        self.words_list.setGeometry(50, 260, 700, 250)
+        self.words_frame = QtWidgets.QFrame(self.central)
+        self.words_frame.setGeometry(50, 260, 700, 250)
+        self.words_counter = QtWidgets.QLabel(self.words_frame)
+        self.words_counter.setGeometry(10, 5, 480, 35)
+        self.words_counter.setObjectName("wordsCounter")
+        self.words_counter.installEventFilter(self)
+        self.sort_box = QtWidgets.QComboBox(self.words_frame)
+        self.sort_box.setGeometry(500, 8, 190, 30)
+        self.sort_box.addItems(GuessedWordsProxy.MODES)
+        self.words_model = GuessedWordsModel()
+        self.words_proxy = GuessedWordsProxy(self.words_model)
+        self.words_list = QtWidgets.QListView(self.words_frame)
+        self.words_list.setGeometry(10, 45, 680, 195)
+        self.words_list.setObjectName("wordsList")
+        self.words_list.setModel(self.words_proxy)
+        self.words_list.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.words_list.setSelectionMode(QtWidgets.QAbstractItemView.NoSelection)
+        # Рисуются только видимые строки; одинаковая высота строк избавляет от пересчёта раскладки
+        self.words_list.setUniformItemSizes(True)
+        self.words_list.setLayoutMode(QtWidgets.QListView.Batched)
+        self.words_delegate = GroupedWordDelegate(self.words_list)
+        self.words_list.setItemDelegate(self.words_delegate)
         self.prev_btn = QtWidgets.QPushButton("Предыдущий уровень", self.central)
         self.prev_btn.setGeometry(50, 530, 180, 40)
         self.next_btn = QtWidgets.QPushButton("Следующий уровень", self.central)
         self.next_btn.setGeometry(570, 530, 180, 40)
-        for widget in [self.menu_btn, self.check_btn, self.prev_btn, self.next_btn]:
-            widget.setStyleSheet("""
-                QPushButton {
-                    background: rgba(230,230,230,0.8);
-                    border-radius: 5px;
-                    padding: 5px;
-                    border: 1px solid #aaa;
-                    font-size: 14px;
-                }
-                QPushButton:hover {
-                    background: rgba(210,230,250,0.9);
-                }
-            """)
-        for frame in [self.source_frame, self.word_frame, self.words_list]:
-            frame.setStyleSheet("""
-                background: rgba(245,245,245,0.85);
-                border-radius: 5px;
-                border: 1px solid #bbb;
-            """)
-        self.level_label.setStyleSheet("""
-            font-size: 24px;
-            font-weight: bold;
-            background: rgba(245,245,245,0.85);
-            border-radius: 5px;
-            border: 1px solid #bbb;
-        """)
-        self.source_label.setStyleSheet("font-size: 18px;")
-        self.word_label.setStyleSheet("font-size: 18px;")
-        self.source_word.setStyleSheet("font-size: 24px; font-weight: bold;")
-        self.word_input.setStyleSheet("""
-            font-size: 24px; 
-            font-weight: bold; 
-            border: none;
-            background: transparent;
-        """)
-        self.words_list.setStyleSheet("font-size: 18px; font-weight: bold;")
+        for frame in [self.source_frame, self.word_frame, self.words_frame]:
+            frame.setObjectName("panel")
+        for label in [self.source_label, self.word_label]:
+            label.setObjectName("caption")
+        self.sort_box.currentIndexChanged.connect(self.set_sort_mode)
         self.menu_btn.clicked.connect(self.return_to_menu)
         self.check_btn.clicked.connect(self.check_word)
+        self.hint_btn.clicked.connect(self.show_hint)
+        self.word_input.returnPressed.connect(self.check_word)
+        self.word_input.textChanged.connect(self.show_feedback)
         self.prev_btn.clicked.connect(self.prev_level)
         self.next_btn.clicked.connect(self.next_level)
     
     def set_background(self, path):
-        if os.path.exists(path):
-            self.central.setAutoFillBackground(True)
-            palette = self.central.palette()
-            palette.setBrush(QtGui.QPalette.Window, QtGui.QBrush(QtGui.QPixmap(path)))
-            self.central.setPalette(palette)
-    
-    def load_levels(self):
-        self.levels = [
-            {
-                "name": "Уровень 1",
-                "letters": ["к", "о", "р", "з", "и", "н", "а"],
-                "words": self.load_words(r"C:\Users\1\OneDrive\Рабочий стол\Игра\Возможные слова\1 уровень ответы к слову Корзина.txt"),
-                "required": 5
-            },
-            {
-                "name": "Уровень 2", 
-                "letters": ["п", "а", "р", "о", "в", "о", "з"],
-                "words": self.load_words(r"C:\Users\1\OneDrive\Рабочий стол\Игра\Возможные слова\2 уровень ответы к слову Паровоз.txt"),
-                "required": 5
-            },
-            {
-                "name": "Уровень 3",
-                "letters": ["к", "а", "р", "т", "и", "н", "а"],
-                "words": self.load_words(r"C:\Users\1\OneDrive\Рабочий стол\Игра\Возможные слова\3 уровень ответы к слову Картина.txt"),
-                "required": 5
-            }
-        ]
-        # Загрузка сохранений
-        saved_level, self.guessed_words = GameSave.load_progress()
-        if self.current_level == 0:
-            self.current_level = saved_level
-    
-    def load_words(self, path):
-        if os.path.exists(path):
-            with open(path, 'r', encoding='utf-8') as f:
-                return [line.strip().lower() for line in f if line.strip()]
-        return []
+        ImageCache.shared().fill_background(self.central, path)
+    
+    def apply_settings(self, settings):
+        self.set_background(settings.background_path)
     
     def setup_level(self):
-        if self.current_level >= len(self.levels):
-            self.current_level = len(self.levels) - 1 
-        level = self.levels[self.current_level]
+        level = self.engine.level
         self.level_label.setText(level["name"])
         self.source_word.setText("".join(level["letters"]).upper())
-        self.current_words = level["words"]
-        self.required_words = level["required"]
-        self.guessed_words_list = self.guessed_words.get(str(self.current_level), [])
         # Показываем кнопку "Завершить игру" только на последнем уровне
-        if self.current_level == len(self.levels) - 1:
+        if self.engine.is_last_level():
             self.next_btn.setText("Завершить игру")
         else:
             self.next_btn.setText("Следующий уровень")
         self.update_words_list()
+        self.word_input.clear()
+        self.show_feedback("")
         self.word_input.setFocus()
     
+    @Profiler.timed
     def update_words_list(self):
-        words_html = "<br>".join([word.upper() for word in self.guessed_words_list])
-        self.words_list.setHtml(f"""
-            <p style='font-size:18px; font-weight:bold;'>
-                Список отгаданных слов ({len(self.guessed_words_list)} из {self.required_words}):<br>
-                {words_html}
-            </p>
-        """)
+        self.words_model.set_words(self.engine.level_progress, self.engine.words)
+        self.update_counter()
     
-    def check_word(self):
-        word = self.word_input.text().strip().lower()
-        if not word:
-            return
-        # Проверка букв
-        level = self.levels[self.current_level]
-        temp_letters = level["letters"].copy()
-        valid = True
-        for letter in word:
-            if letter in temp_letters:
-                temp_letters.remove(letter)
+    def update_counter(self):
+        found, required = self.engine.progress()
+        text = f"Список отгаданных слов ({found} из {required}, осталось {self.engine.remaining()}):"
+        bonus = len(self.engine.bonus_words.get(self.engine.current_level, ()))
+        if bonus:
+            text += f" +{bonus} бонус"
+        self.words_counter.setText(text)
+
+    def eventFilter(self, obj, event):
+        # Разбивка оставшихся слов по длине и первой букве собирается из счётчиков LevelHints
+        # только при наведении на счётчик, а не при каждом его обновлении
+        if obj is self.words_counter and event.type() == QtCore.QEvent.ToolTip:
+            lengths, letters = self.engine.hints.breakdown()
+            lengths = ", ".join(f"{length} б. - {n}" for length, n in lengths)
+            letters = ", ".join(f"{letter.upper()} - {n}" for letter, n in letters)
+            if lengths:
+                QtWidgets.QToolTip.showText(event.globalPos(), f"Осталось по длине: {lengths}\nПо первой букве: {letters}", obj)
             else:
-                valid = False
-                break
-        if not valid:
-            QtWidgets.QMessageBox.warning(self, "Ошибка", "Используйте только доступные буквы!")
+                QtWidgets.QToolTip.hideText()
+            return True
+        return super().eventFilter(obj, event)
+
+    def show_hint(self):
+        hint = self.engine.hint()
+        self.feedback_label.setText(f"Подсказка: {hint.upper()}" if hint else "Все слова уже отгаданы")
+        Theme.set_tone(self.feedback_label, "info")
+        self.word_input.setFocus()
+    
+    def on_words_changed(self, number):
+        # Файл ответов уровня изменился (--watch): прогресс переводится на новый список и сохраняется
+        if self.engine.level is None:
             return
-        if word not in self.current_words:
-            QtWidgets.QMessageBox.warning(self, "Ошибка", "Такого слова нет в списке!")
+        self.engine.save()
+        if number == self.engine.current_level:
+            self.engine.sync()
+            self.update_words_list()
+            self.show_feedback(self.word_input.text())
+    
+    def set_sort_mode(self, mode):
+        grouped = mode == 2
+        self.words_delegate.grouped = grouped
+        self.words_list.setUniformItemSizes(not grouped)
+        self.words_proxy.set_mode(mode)
+    
+    # Сообщение и оттенок (свойство tone в Theme) для каждого состояния
+    FEEDBACK = {
+        GameEngine.INVALID_LETTERS: ("Используйте только доступные буквы!", "error"),
+        GameEngine.DEAD_END: ("Слов с таким началом нет", "error"),
+        GameEngine.PREFIX: ("", ""),
+        GameEngine.COMPLETE: ("Есть такое слово! Нажмите Enter", "success"),
+        GameEngine.DUPLICATE: ("Это слово уже отгадано", "warning"),
+        GameEngine.NOT_IN_LIST: ("Такого слова нет в списке!", "error"),
+        GameEngine.ACCEPTED: ("Слово принято!", "success"),
+        GameEngine.BONUS: ("Бонусное слово! В зачёт уровня не идёт", "info"),
+    }
+    
+    def show_feedback(self, text):
+        state, _ = self.engine.feedback(text)
+        self.set_feedback(state)
+    
+    def set_feedback(self, state, suggestions=()):
+        message, tone = self.FEEDBACK.get(state, ("", ""))
+        if suggestions:
+            message += " Может быть: " + ", ".join(suggestions).upper() + "?"
+        self.feedback_label.setText(message)
+        Theme.set_tone(self.feedback_label, tone)
+    
+    def check_word(self):
+        # Результат показывается под полем ввода, без модальных окон
+        result, word = self.engine.submit(self.word_input.text())
+        if result == GameEngine.EMPTY:
             return
-        if word in self.guessed_words_list:
-            self.word_input.clear()
+        if result in (GameEngine.INVALID_LETTERS, GameEngine.NOT_IN_LIST):
+            self.set_feedback(result, self.engine.suggest(word))
             return
-        self.guessed_words_list.append(word)
-        self.guessed_words[str(self.current_level)] = self.guessed_words_list
-        GameSave.save_progress(self.current_level, self.guessed_words)
-        self.update_words_list()
         self.word_input.clear()
+        self.set_feedback(result)
+        if result == GameEngine.DUPLICATE:
+            return
+        if result == GameEngine.BONUS:
+            self.update_counter()
+            return
+        self.words_model.append(word)
+        self.update_counter()
         self.parent.audio.play_sound(self.parent.click_sound)
     
     def prev_level(self):
         self.parent.audio.play_sound(self.parent.click_sound)
-        if self.current_level > 0:
-            self.current_level -= 1
-            GameSave.save_progress(self.current_level, self.guessed_words)
+        if self.engine.prev_level():
             self.setup_level()
     
     def next_level(self):
         self.parent.audio.play_sound(self.parent.click_sound)
-        if len(self.guessed_words_list) >= self.required_words:
-            if self.current_level < len(self.levels) - 1:
-                self.current_level += 1
-                GameSave.save_progress(self.current_level, self.guessed_words)
+        if self.engine.can_advance():
+            if not self.engine.is_last_level():
+                self.engine.next_level()
                 self.setup_level()
             else:
                 # Действия при завершении игры
@@ -613,34 +1153,48 @@ class GameWindow(QtWidgets.QMainWindow):
                     "Поздравляем!", 
                     "Вы прошли все уровни игры!"
                 )
-                GameSave.reset_progress()
+                self.engine.reset()
                 self.return_to_menu()
         else:
             QtWidgets.QMessageBox.warning(
                 self,
                 "Недостаточно слов",
-                f"Нужно отгадать {self.required_words} слов для перехода!"
+                f"Нужно отгадать {self.engine.required} слов для перехода!"
             )
         
     def return_to_menu(self):
-        GameSave.save_progress(self.current_level, self.guessed_words)
+        self.engine.save()
         self.parent.show()
-        self.close()
+        self.hide()
     
     def closeEvent(self, event):
-        GameSave.save_progress(self.current_level, self.guessed_words)
+        self.engine.save()
         event.accept()
 
+def check_assets(music_path, click_path):
+    assets = Assets.shared()
+    def status(name):
+        return f"{'✓' if assets.exists(name) else '✗'} {assets.location(name)}"
+    lines = ["Проверка доступности файлов:"]
+    for i, name in enumerate(SettingsManager.BACKGROUNDS):
+        lines.append(f"{i+1}. {status(name)}")
+    lines.append(f"\nМузыка: {status(music_path)}")
+    lines.append(f"Звук: {status(click_path)}")
+    print("\n".join(lines))
+
 # Запуск приложения
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Игра Слова из слова")
+    parser.add_argument("--startup-timer", action="store_true", help="показать время запуска")
+    parser.add_argument("--watch", action="store_true", help="перечитывать файлы ответов уровней при их изменении")
+    add_arguments(parser)
+    args = parser.parse_args()
+    if run_command(args):
+        sys.exit()
     app = QtWidgets.QApplication([])
-    print("Проверка доступности файлов:")
-    for i, path in enumerate(SettingsManager.BACKGROUNDS):
-        print(f"{i+1}. {'✓' if os.path.exists(path) else '✗'} {path}")
-    music_path = r"C:\Users\1\OneDrive\Рабочий стол\Игра\Музыка, звуки, фон\Фоновая музыка.mp3"
-    click_path = r"C:\Users\1\OneDrive\Рабочий стол\Игра\Музыка, звуки, фон\звук клика.mp3"
-    print(f"\nМузыка: {'✓' if os.path.exists(music_path) else '✗'} {music_path}")
-    print(f"Звук: {'✓' if os.path.exists(click_path) else '✗'} {click_path}")
+    StartupTimer.mark("QApplication создан")
     window = MainMenu()
+    if args.watch and window.watch_levels() is None:
+        print(f"--watch работает только без набора уровней {Assets.shared().location(LevelSource.PACK_ASSET)}")
     window.show()
-    app.exec_()
\ No newline at end of file
+    Profiler.run_event_loop(app)
\ No newline at end of file